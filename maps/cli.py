@@ -10,9 +10,10 @@ and territory analysis.
 import argparse
 import json
 import sys
-from typing import Any, Dict, Optional, Tuple
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
-import geopandas as gpd
+import shapely
 from shapely.geometry import MultiPolygon
 
 from maps.draw_map import load_country_data
@@ -21,13 +22,17 @@ from maps.language_config import (
     get_supported_languages,
     is_language_supported,
 )
-from maps.models import MapConfiguration
+from maps.models import BOUNDS_COLUMNS, MapConfiguration
 from maps.renderer import create_map
 from maps.territory_analyzer import (
     TerritoryAnalyzer,
     get_country_territory_info,
 )
 
+if TYPE_CHECKING:
+    # Only needed for annotations; the frames come from load_country_data
+    import geopandas as gpd
+
 
 def parse_args(args: Optional[list[str]] = None) -> argparse.Namespace:
     """
@@ -53,6 +58,42 @@ def parse_args(args: Optional[list[str]] = None) -> argparse.Namespace:
         # Insert the default "map" command
         args.insert(0, "map")
 
+    # Parse the arguments
+    parsed_args = _get_parser().parse_args(args)
+
+    # Default command is 'map' if no command specified (should not happen with our logic above)
+    if not parsed_args.command and not parsed_args.list_languages:
+        parsed_args.command = "map"
+
+    # Handle list-languages option
+    if parsed_args.list_languages:
+        _print_supported_languages()
+        sys.exit(0)
+
+    # Validate language parameter if provided
+    if hasattr(parsed_args, "language") and parsed_args.language:
+        if not is_language_supported(parsed_args.language):
+            supported_langs = ", ".join(get_supported_languages())
+            sys.stderr.write(
+                f"Error: Unsupported language code '{parsed_args.language}'. "
+                f"Supported languages are: {supported_langs}\n"
+            )
+            sys.exit(1)
+
+    return parsed_args
+
+
+@lru_cache(maxsize=None)
+def _get_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser for the CLI, once per process.
+
+    An ArgumentParser can parse any number of argument lists, so parse_args reuses this
+    instance instead of adding every argument again on each call.
+
+    Returns:
+        ArgumentParser with the 'map' and 'analyze' sub-commands
+    """
     parser = argparse.ArgumentParser(
         description="Generate maps and analyze territories of countries."
     )
@@ -78,29 +119,7 @@ def parse_args(args: Optional[list[str]] = None) -> argparse.Namespace:
     )
     _add_analyze_arguments(analyze_parser)
 
-    # Parse the arguments
-    parsed_args = parser.parse_args(args)
-
-    # Default command is 'map' if no command specified (should not happen with our logic above)
-    if not parsed_args.command and not parsed_args.list_languages:
-        parsed_args.command = "map"
-
-    # Handle list-languages option
-    if parsed_args.list_languages:
-        _print_supported_languages()
-        sys.exit(0)
-
-    # Validate language parameter if provided
-    if hasattr(parsed_args, "language") and parsed_args.language:
-        if not is_language_supported(parsed_args.language):
-            supported_langs = ", ".join(get_supported_languages())
-            sys.stderr.write(
-                f"Error: Unsupported language code '{parsed_args.language}'. "
-                f"Supported languages are: {supported_langs}\n"
-            )
-            sys.exit(1)
-
-    return parsed_args
+    return parser
 
 
 def _print_supported_languages() -> None:
@@ -245,11 +264,20 @@ def _add_analyze_arguments(parser: argparse.ArgumentParser) -> None:
 
 
 def filter_exclaves(
-    target_country: gpd.GeoDataFrame, territory_info: Dict[str, Any]
-) -> Tuple[gpd.GeoDataFrame, Optional[float]]:
+    target_country: "gpd.GeoDataFrame", territory_info: Dict[str, Any]
+) -> Tuple["gpd.GeoDataFrame", Optional[float]]:
     """
     Filter out exclaves from a country's geometry, keeping only the main landmass.
 
+    The main landmass is the territory with the highest percentage in territory_info.
+    When territories carry their part "index" (as produced by
+    get_country_territory_info), that part is selected directly without any area
+    computation; otherwise the largest part is found by area.
+
+    If territory_info shows there is nothing to filter (a single territory, or neither
+    exclaves nor an island nation), the target country is returned as-is without
+    inspecting its geometry.
+
     Args:
         target_country: GeoDataFrame containing the target country
         territory_info: Dictionary with territory information from territory_analyzer
@@ -259,20 +287,40 @@ def filter_exclaves(
             - Modified GeoDataFrame with only the main landmass
             - Percentage of the total area represented by the main landmass, or None if no filtering was done
     """
-    # Get the main polygon (largest by area)
-    main_territory_info = territory_info["territories"][0]
+    # Get the main territory (largest share of the total area)
+    main_territory_info = max(
+        territory_info["territories"], key=lambda t: t["percentage"]
+    )
     percentage = main_territory_info["percentage"]
 
+    # Nothing to filter, so skip all geometry work
+    single_territory = len(territory_info["territories"]) <= 1
+    continuous = not (
+        territory_info.get("has_exclaves", True)
+        or territory_info.get("is_island_nation", True)
+    )
+    if single_territory or continuous:
+        return target_country, percentage
+
     # Get the target country geometry
     target_geom = target_country.geometry.iloc[0]
 
     if isinstance(target_geom, MultiPolygon):
-        # Find the largest polygon (main territory) based on territory analysis
-        main_polygon = max(target_geom.geoms, key=lambda p: p.area)
+        parts = shapely.get_parts(target_geom)
+        main_index = main_territory_info.get("index")
+        if main_index is None:
+            # No part index available, so find the largest part by area
+            main_index = shapely.area(parts).argmax()
+        main_polygon = parts[main_index]
 
         # Create a new geometry with just the main territory
         filtered_country = target_country.copy()
         filtered_country.loc[filtered_country.index[0], "geometry"] = main_polygon
+        if set(BOUNDS_COLUMNS).issubset(filtered_country.columns):
+            # Keep the precomputed bounding box in sync with the new geometry
+            filtered_country.loc[filtered_country.index[0], BOUNDS_COLUMNS] = (
+                main_polygon.bounds
+            )
 
         return filtered_country, percentage
 
@@ -312,7 +360,10 @@ def generate_map(args: argparse.Namespace) -> None:
         # Add territory information if requested or if excluding exclaves
         territory_info = None
         if getattr(args, "show_territory_info", False) or exclude_exclaves:
-            territory_info = get_country_territory_info(country_name, db_path)
+            # The per-territory breakdown is only needed to filter out exclaves
+            territory_info = get_country_territory_info(
+                country_name, db_path, include_territories=exclude_exclaves
+            )
             territory_type = territory_info["territory_type"]
 
             # Update title if showing territory info
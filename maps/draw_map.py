@@ -3,12 +3,11 @@
 
 import os
 import sqlite3
-from typing import Any, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
-import geopandas as gpd  # type: ignore
 import pandas as pd
+import shapely
 from pandas import DataFrame
-from shapely import wkb
 
 # Import functionality from find_neighbors.py
 from maps.find_neighbors import (
@@ -18,8 +17,26 @@ from maps.find_neighbors import (
 )
 
 # Import from our refactored code
-from maps.language_config import get_language_column
-from maps.models import ShapelyGeometry
+from maps.language_config import (
+    DEFAULT_LANGUAGE_COLUMN,
+    get_language_column,
+    get_supported_languages,
+)
+from maps.models import BOUNDS_COLUMNS
+
+if TYPE_CHECKING:
+    # Only needed for annotations here; load_country_data imports it when called
+    import geopandas as gpd
+
+# The country query for every name column a language can map to, built once. The
+# column set is small and fixed, so nothing is formatted per call.
+_COUNTRIES_QUERIES: Dict[str, str] = {
+    column: f"SELECT name, iso_a3, {column}, GEOMETRY FROM ne_10m_admin_0_countries"
+    for column in {
+        DEFAULT_LANGUAGE_COLUMN,
+        *map(get_language_column, get_supported_languages()),
+    }
+}
 
 # Use the module-level imported functions for backward compatibility with tests
 
@@ -29,7 +46,7 @@ def load_country_data(
     country_name: CountryName,
     db_path: DBPath = "natural_earth_vector.sqlite",
     language: str = "en",
-) -> Tuple[gpd.GeoDataFrame, gpd.GeoDataFrame, List[str]]:
+) -> Tuple["gpd.GeoDataFrame", "gpd.GeoDataFrame", List[str]]:
     """
     Load country data from Natural Earth database.
 
@@ -40,7 +57,8 @@ def load_country_data(
 
     Returns:
         Tuple containing:
-            - GeoDataFrame with all countries
+            - GeoDataFrame with all countries, including precomputed bounding box
+              columns (see BOUNDS_COLUMNS)
             - GeoDataFrame with just the target country
             - List of neighbor country names
     """
@@ -62,30 +80,34 @@ def load_country_data(
         # Get the column name for the requested language
         lang_column = get_language_column(language)
 
-        # Build the query to include the language column
-        query: str = f"SELECT name, iso_a3, {lang_column}, GEOMETRY FROM ne_10m_admin_0_countries"
+        # Pick the prebuilt query that includes the language column
+        query: str = _COUNTRIES_QUERIES[lang_column]
 
         conn: sqlite3.Connection = sqlite3.connect(db_path)
 
-        # Load all countries with geometries
-        df: DataFrame = pd.read_sql(query, conn)
-
-        # Convert the BLOB geometry to shapely geometries
-        def convert_geometry(blob: Any) -> Optional[ShapelyGeometry]:
-            if blob is None:
-                return None
-            try:
-                return wkb.loads(blob)
-            except Exception:
-                return None
+        # Load all countries with geometries; the rows are handed to pandas as-is,
+        # without read_sql's generic per-column type inference
+        cursor: sqlite3.Cursor = conn.execute(query)
+        df: DataFrame = pd.DataFrame.from_records(
+            cursor.fetchall(), columns=[column[0] for column in cursor.description]
+        )
 
-        df["geometry"] = df["GEOMETRY"].apply(convert_geometry)  # type: ignore
+        # Convert the BLOB geometries in one vectorized call; NULL or invalid
+        # blobs become missing geometries
+        df["geometry"] = shapely.from_wkb(
+            df["GEOMETRY"].to_numpy(), on_invalid="ignore"
+        )
         df = df.drop("GEOMETRY", axis=1)
 
         # Convert to GeoDataFrame
+        import geopandas as gpd
+
         countries: gpd.GeoDataFrame = gpd.GeoDataFrame(df, geometry="geometry")
         countries.crs = "EPSG:4326"  # Set coordinate reference system
 
+        # Precompute all bounding boxes in one vectorized call for the renderer
+        countries[BOUNDS_COLUMNS] = shapely.bounds(countries.geometry.to_numpy())
+
         # Fix missing ISO codes
         countries["display_iso"] = countries["iso_a3"].apply(
             lambda x: "N/A" if x == "-99" or not x else x,
@@ -93,11 +115,9 @@ def load_country_data(
 
         # Create a display_name column using the requested language
         # If the language-specific name is empty or None, fall back to English name
-        countries["display_name"] = countries.apply(
-            lambda row: row[lang_column]
-            if row[lang_column] and pd.notna(row[lang_column])
-            else row["name"],
-            axis=1,
+        localized_names = countries[lang_column]
+        countries["display_name"] = localized_names.where(
+            localized_names.notna() & (localized_names != ""), countries["name"]
         )
 
         # Get the target country
@@ -5,28 +5,50 @@ import argparse
 import os
 import sqlite3
 from dataclasses import dataclass
-from typing import List, Optional, Union, cast
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Union, cast
 
-import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
 from pandas import DataFrame
-from shapely import wkb
 from shapely.geometry.base import BaseGeometry
 
+if TYPE_CHECKING:
+    # geopandas is imported where GeoDataFrames are built, so importing this module
+    # (e.g. while collecting tests) does not load it
+    import geopandas as gpd
+
+# ISO codes Natural Earth uses for countries without one
+_MISSING_ISO_CODES: frozenset[Optional[str]] = frozenset({"", "-99", None})
+
 
 # Custom types
 @dataclass(frozen=True)
 class CountryRecord:
     """Represents a country record with essential information."""
 
+    # Declared by hand because dataclass(slots=True) needs Python 3.10; one record is
+    # created per country row, so dropping the per-instance __dict__ adds up
+    __slots__ = ("name", "name_long", "iso_code")
+
     name: str
     name_long: str
     iso_code: str
 
+    def __getstate__(self) -> tuple[str, str, str]:
+        """Return the field values, so copy and pickle work without a __dict__."""
+        return self.name, self.name_long, self.iso_code
+
+    def __setstate__(self, state: tuple[str, str, str]) -> None:
+        """Restore the field values, bypassing the frozen __setattr__."""
+        for field_name, value in zip(self.__slots__, state):
+            object.__setattr__(self, field_name, value)
+
     @property
     def display_iso(self) -> str:
         """Return formatted ISO code, showing N/A for missing values."""
-        return "N/A" if self.iso_code == "-99" or not self.iso_code else self.iso_code
+        return format_iso_code(self.iso_code)
 
 
 # Type aliases
@@ -77,12 +99,33 @@ def list_country_names(
             conn.close()
 
 
+def _is_cache_fresh(cache_path: str, source_path: str) -> bool:
+    """
+    Check whether a cache file exists and is not older than its source file.
+
+    Args:
+        cache_path: Path of the cache file
+        source_path: Path of the file the cache was built from
+
+    Returns:
+        True if the cache can be used, False if it is missing or stale
+    """
+    if not os.path.exists(cache_path):
+        return False
+    if not os.path.exists(source_path):
+        return True
+    return os.path.getmtime(cache_path) >= os.path.getmtime(source_path)
+
+
 def get_countries_df(
     db_path: DBPath, cache_path: str = "countries_df.parquet"
 ) -> DataFrame:
     """
     Load countries DataFrame from SQLite database or cached parquet file.
 
+    The cache is only used while it is at least as new as the database file, so
+    replacing the database rebuilds it on the next call.
+
     Args:
         db_path: Path to the Natural Earth SQLite database
         cache_path: Path to save/load cached DataFrame
@@ -91,11 +134,11 @@ def get_countries_df(
         DataFrame containing country data with shapely geometries
     """
     # Try loading from cache first
-    if os.path.exists(cache_path):
+    if _is_cache_fresh(cache_path, db_path):
         print("Loading countries from cache...")
         df = pd.read_parquet(cache_path)
-        # Convert the cached WKB geometry strings back to shapely objects
-        df["geometry"] = df["geometry"].apply(wkb.loads)
+        # Convert the cached WKB geometries back to shapely objects in one call
+        df["geometry"] = shapely.from_wkb(df["geometry"].to_numpy())
         return df
 
     print("Loading countries from database...")
@@ -109,28 +152,49 @@ def get_countries_df(
     df: DataFrame = pd.read_sql(query, conn)
     print(f"Loaded {len(df)} countries")
 
-    # Convert the BLOB geometry to shapely geometries
+    # Convert the BLOB geometry to shapely geometries in one vectorized call;
+    # NULL and empty blobs become missing geometries
     print("Converting BLOB geometries to shapely objects...")
-    df["geometry"] = df["GEOMETRY"].apply(lambda x: wkb.loads(x) if x else None)
+    blobs = df["GEOMETRY"].to_numpy()
+    df["geometry"] = shapely.from_wkb(np.where(blobs == b"", None, blobs))
     df = df.drop("GEOMETRY", axis=1)
 
     # Fix missing ISO codes
-    df["display_iso"] = df["iso_a3"].apply(
-        lambda x: "N/A" if x == "-99" or not x else x
-    )
+    df["display_iso"] = df["iso_a3"].map(format_iso_code)
 
     # Cache the DataFrame
     # Convert geometries to WKB for storage
     df_to_cache = df.copy()
-    df_to_cache["geometry"] = df_to_cache["geometry"].apply(
-        lambda x: x.wkb if x else None
-    )
+    df_to_cache["geometry"] = shapely.to_wkb(df_to_cache["geometry"].to_numpy())
     df_to_cache.to_parquet(cache_path)
 
     conn.close()
     return df
 
 
+def _envelopes_intersect(
+    envelopes: np.ndarray, bounds: tuple[float, float, float, float]
+) -> np.ndarray:
+    """
+    Find the envelopes that intersect a bounding box.
+
+    Args:
+        envelopes: Array of (minx, miny, maxx, maxy) rows, as from shapely.bounds
+        bounds: Bounding box (minx, miny, maxx, maxy) to test against
+
+    Returns:
+        Boolean mask, True where the envelope intersects the bounding box; missing
+        geometries (NaN bounds) never match
+    """
+    minx, miny, maxx, maxy = bounds
+    return (
+        (envelopes[:, 0] <= maxx)
+        & (envelopes[:, 2] >= minx)
+        & (envelopes[:, 1] <= maxy)
+        & (envelopes[:, 3] >= miny)
+    )
+
+
 def get_neighboring_countries(
     country_name: CountryName,
     db_path: DBPath = "natural_earth_vector.sqlite",
@@ -142,6 +206,8 @@ def get_neighboring_countries(
     if not os.path.exists(db_path):
         return f"Database file not found: {db_path}"
 
+    import geopandas as gpd
+
     try:
         # Load countries DataFrame
         df = get_countries_df(db_path)
@@ -172,20 +238,33 @@ def get_neighboring_countries(
         # Find all countries that touch the target country
         print("Finding neighbors...")
         target_geometry: BaseGeometry = target_country.iloc[0].geometry
-        neighbors: gpd.GeoDataFrame = countries[
-            countries.geometry.touches(target_geometry)
-        ]
+        geometries = countries.geometry.to_numpy()
+        # Filter then refine: a country can only touch the target if their bounding
+        # boxes meet, so the exact predicate only runs on those candidates
+        envelopes = shapely.bounds(geometries)
+        candidates = _envelopes_intersect(envelopes, target_geometry.bounds)
+        # Prepare the target once, so GEOS indexes its edges and reuses the index for
+        # every candidate instead of scanning all of its vertices per comparison
+        shapely.prepare(target_geometry)
+        is_neighbor = np.zeros(len(countries), dtype=bool)
+        is_neighbor[candidates] = shapely.touches(
+            target_geometry, geometries[candidates]
+        )
+        neighbors: gpd.GeoDataFrame = countries[is_neighbor]
 
         if len(neighbors) == 0:
             print("No neighbors found using 'touches'. Trying with buffer...")
             # If no neighbors found, try with a small buffer to account for precision issues
             target_geom: BaseGeometry = target_country.iloc[0].geometry
             buffered: BaseGeometry = target_geom.buffer(0.01)  # ~1km buffer
-            neighbors = countries[
-                (countries["ogc_fid"] != target_country.iloc[0]["ogc_fid"])
-                & (countries.geometry.intersects(buffered))
-                & ~(countries.geometry.covers(target_geom))
-            ]
+            shapely.prepare(buffered)
+            candidates = _envelopes_intersect(envelopes, buffered.bounds) & (
+                countries["ogc_fid"] != target_country.iloc[0]["ogc_fid"]
+            ).to_numpy()
+            is_neighbor[candidates] = shapely.intersects(
+                buffered, geometries[candidates]
+            ) & ~shapely.covers(geometries[candidates], target_geom)
+            neighbors = countries[is_neighbor]
 
         # Return the names and ISO codes of neighboring countries
         result: NeighborsList = [
@@ -210,6 +289,20 @@ def parse_args() -> argparse.Namespace:
     Returns:
         Parsed arguments namespace
     """
+    return _get_parser().parse_args()
+
+
+@lru_cache(maxsize=None)
+def _get_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser, once per process.
+
+    An ArgumentParser can parse any number of argument lists, so parse_args reuses this
+    instance instead of adding every argument again on each call.
+
+    Returns:
+        ArgumentParser for the find_neighbors command line
+    """
     parser: argparse.ArgumentParser = argparse.ArgumentParser(
         description="Find neighboring countries using Natural Earth data",
     )
@@ -229,7 +322,7 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="List all country names available in the database",
     )
-    return parser.parse_args()
+    return parser
 
 
 def format_iso_code(iso_code: str) -> str:
@@ -242,7 +335,7 @@ def format_iso_code(iso_code: str) -> str:
     Returns:
         Formatted ISO code
     """
-    return "N/A" if iso_code == "-99" or not iso_code else iso_code
+    return "N/A" if iso_code in _MISSING_ISO_CODES else iso_code
 
 
 def main() -> None:
@@ -5,7 +5,8 @@ This module provides functionality for handling and validating
 different language options for map labels.
 """
 
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 # Map language codes to their corresponding database column names
 LANGUAGE_MAPPINGS: Dict[str, str] = {
@@ -37,33 +38,68 @@ LANGUAGE_MAPPINGS: Dict[str, str] = {
     "zht": "name_zht",  # Chinese (Traditional)
 }
 
+# Full names of the supported languages, for display
+LANGUAGE_NAMES: Dict[str, str] = {
+    "en": "English",
+    "ar": "Arabic",
+    "bn": "Bengali",
+    "de": "German",
+    "es": "Spanish",
+    "fa": "Persian",
+    "fr": "French",
+    "el": "Greek",
+    "he": "Hebrew",
+    "hi": "Hindi",
+    "hu": "Hungarian",
+    "id": "Indonesian",
+    "it": "Italian",
+    "ja": "Japanese",
+    "ko": "Korean",
+    "nl": "Dutch",
+    "pl": "Polish",
+    "pt": "Portuguese",
+    "ru": "Russian",
+    "sv": "Swedish",
+    "tr": "Turkish",
+    "uk": "Ukrainian",
+    "ur": "Urdu",
+    "vi": "Vietnamese",
+    "zh": "Chinese (Simplified)",
+    "zht": "Chinese (Traditional)",
+}
+
 # Default language column to use if no language is specified or if a language is not supported
 DEFAULT_LANGUAGE_COLUMN: str = "name"
 
 
-def get_supported_languages() -> List[str]:
+@lru_cache(maxsize=1)
+def get_supported_languages() -> Tuple[str, ...]:
     """
-    Get a list of supported language codes.
+    Get the supported language codes, sorted.
+
+    The codes are sorted once and cached; a tuple is returned so callers cannot
+    modify the shared result.
 
     Returns:
-        List of supported language codes (e.g., 'en', 'fr', 'es', etc.)
+        Tuple of supported language codes (e.g., 'en', 'fr', 'es', etc.)
     """
-    return sorted(list(LANGUAGE_MAPPINGS.keys()))
+    return tuple(sorted(LANGUAGE_MAPPINGS))
 
 
 def is_language_supported(language_code: Optional[str]) -> bool:
     """
     Check if a language code is supported.
 
+    Anything that is not a string (None, or an unhashable value passed by mistake) is
+    rejected before the lookup, so this never raises.
+
     Args:
         language_code: Two-letter language code to check
 
     Returns:
         True if the language is supported, False otherwise
     """
-    if not language_code:
-        return False
-    return language_code in LANGUAGE_MAPPINGS
+    return isinstance(language_code, str) and language_code in LANGUAGE_MAPPINGS
 
 
 def get_language_column(language_code: str, fallback: Optional[str] = None) -> str:
@@ -95,35 +131,7 @@ def get_language_name(language_code: str) -> str:
     Returns:
         Full name of the language, or "Unknown" if the language code is not supported
     """
-    language_names = {
-        "en": "English",
-        "ar": "Arabic",
-        "bn": "Bengali",
-        "de": "German",
-        "es": "Spanish",
-        "fa": "Persian",
-        "fr": "French",
-        "el": "Greek",
-        "he": "Hebrew",
-        "hi": "Hindi",
-        "hu": "Hungarian",
-        "id": "Indonesian",
-        "it": "Italian",
-        "ja": "Japanese",
-        "ko": "Korean",
-        "nl": "Dutch",
-        "pl": "Polish",
-        "pt": "Portuguese",
-        "ru": "Russian",
-        "sv": "Swedish",
-        "tr": "Turkish",
-        "uk": "Ukrainian",
-        "ur": "Urdu",
-        "vi": "Vietnamese",
-        "zh": "Chinese (Simplified)",
-        "zht": "Chinese (Traditional)",
-    }
-    return language_names.get(language_code, "Unknown")
+    return LANGUAGE_NAMES.get(language_code, "Unknown")
 
 
 def get_display_info() -> List[Dict[str, str]]:
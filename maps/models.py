@@ -6,7 +6,9 @@ This module defines data classes and type aliases used throughout the package
 for map generation, styling, and configuration.
 """
 
+import math
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Literal, Tuple
 
 from shapely.geometry.base import BaseGeometry
@@ -17,6 +19,9 @@ ShapelyGeometry = BaseGeometry
 # Type for label display options
 LabelType = Literal["code", "name"]
 
+# Columns holding each country's precomputed bounding box (minx, miny, maxx, maxy)
+BOUNDS_COLUMNS = ["minx", "miny", "maxx", "maxy"]
+
 
 @dataclass(frozen=True)
 class MapColors:
@@ -80,3 +85,16 @@ class MapConfiguration:
     label_type: LabelType = "name"
     border_width: float = 0.5
     language: str = "en"
+
+    @cached_property
+    def scale_factor(self) -> float:
+        """
+        Side length of the map view relative to the target country's bounding box.
+
+        Derived from target_percentage and cached on first use, so it is computed once
+        per configuration instead of on every render. Being a property rather than a
+        field, it is left out of asdict(), fields() and the dataclass repr.
+        """
+        # For a square view, the target percentage is based on area
+        # If target should occupy 30% of the area, the side length ratio is sqrt(0.3)
+        return 1.0 / math.sqrt(self.target_percentage)
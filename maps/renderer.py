@@ -4,21 +4,77 @@ Renderer module for the maps package.
 
 This module provides functionality for rendering maps of countries and their neighbors
 using matplotlib and geopandas.
+
+Maps are drawn on a bare matplotlib ``Figure`` instead of through ``pyplot``, so no
+global figure state is created and no backend is selected on import.
 """
 
-import math
-from typing import List
+from typing import TYPE_CHECKING, List, Tuple
 
-import geopandas as gpd
-import matplotlib.pyplot as plt
+import numpy as np
+import shapely
+from matplotlib.collections import PathCollection
+from matplotlib.figure import Figure
+from matplotlib.path import Path
 from shapely.geometry import MultiPolygon, Point, box
 
-from maps.models import MapConfiguration
+from maps.models import BOUNDS_COLUMNS, MapConfiguration
+
+if TYPE_CHECKING:
+    # Only needed for annotations; the renderer works on the frames it is given
+    import geopandas as gpd
+
+
+def _build_country_paths(geometries: np.ndarray) -> Tuple[List[Path], np.ndarray]:
+    """
+    Convert country geometries to matplotlib paths in a few vectorized passes.
+
+    Every country becomes one compound path made of the rings of all its polygons.
+    Rings are oriented so that exteriors are counter-clockwise and holes clockwise,
+    which lets matplotlib's nonzero fill rule cut the holes out.
+
+    Args:
+        geometries: Array of Polygon/MultiPolygon geometries (None entries are allowed)
+
+    Returns:
+        Tuple of (paths, country_indices) where country_indices[i] is the position in
+        ``geometries`` of the country drawn by paths[i]. Countries without any
+        coordinates get no path.
+    """
+    parts, part_country = shapely.get_parts(geometries, return_index=True)
+    rings, ring_part = shapely.get_rings(parts, return_index=True)
+
+    # The first ring of each polygon is its exterior
+    is_exterior = np.ones(len(rings), dtype=bool)
+    is_exterior[1:] = ring_part[1:] != ring_part[:-1]
+    flip = shapely.is_ccw(rings) != is_exterior
+    rings[flip] = shapely.reverse(rings[flip])
+
+    coords, coord_ring = shapely.get_coordinates(rings, return_index=True)
+    if len(coords) == 0:
+        return [], np.empty(0, dtype=np.intp)
+
+    # Each ring starts with MOVETO and its closing vertex becomes CLOSEPOLY
+    codes = np.full(len(coords), Path.LINETO, dtype=Path.code_type)
+    ring_starts = np.flatnonzero(np.r_[True, coord_ring[1:] != coord_ring[:-1]])
+    codes[ring_starts] = Path.MOVETO
+    codes[np.r_[ring_starts[1:], len(coords)] - 1] = Path.CLOSEPOLY
+
+    # Split the flat arrays at country boundaries
+    coord_country = part_country[ring_part[coord_ring]]
+    country_indices, country_starts = np.unique(coord_country, return_index=True)
+    paths = [
+        Path(vertices, path_codes)
+        for vertices, path_codes in zip(
+            np.split(coords, country_starts[1:]), np.split(codes, country_starts[1:])
+        )
+    ]
+    return paths, country_indices
 
 
 def create_map(
-    countries: gpd.GeoDataFrame,
-    target_country: gpd.GeoDataFrame,
+    countries: "gpd.GeoDataFrame",
+    target_country: "gpd.GeoDataFrame",
     neighbor_names: List[str],
     config: MapConfiguration,
 ) -> None:
@@ -29,6 +85,9 @@ def create_map(
     and saves it to the specified output path. The map view is forced to be square
     regardless of the figure's dimensions.
 
+    If target_country carries the bounding box columns added by load_country_data,
+    they are used instead of recomputing the bounds from the geometry.
+
     Args:
         countries: GeoDataFrame containing all countries
         target_country: GeoDataFrame containing only the target country
@@ -38,8 +97,9 @@ def create_map(
     Returns:
         None. The map is saved to the path specified in config.output_path
     """
-    # Create a new figure
-    fig, ax = plt.subplots(figsize=config.figsize)
+    # Create a new figure, not registered with pyplot
+    fig = Figure(figsize=config.figsize, dpi=config.dpi)
+    ax = fig.subplots()
 
     # Set the title
     ax.set_title(config.title, fontsize=14, fontweight="bold")
@@ -49,13 +109,18 @@ def create_map(
 
     # Handle exclaves if requested
     if config.exclude_exclaves and isinstance(target_geom, MultiPolygon):
-        # Find the largest polygon (main territory)
-        main_territory = max(target_geom.geoms, key=lambda p: p.area)
+        # Find the largest polygon (main territory), computing all areas in one call
+        parts = shapely.get_parts(target_geom)
+        main_territory = parts[shapely.area(parts).argmax()]
         # Create a new geometry with just the main territory
         target_geom = main_territory
-
-    # Calculate the bounding box of the target geometry
-    bounds = target_geom.bounds  # (minx, miny, maxx, maxy)
+        bounds = target_geom.bounds  # (minx, miny, maxx, maxy)
+    elif set(BOUNDS_COLUMNS).issubset(target_country.columns):
+        # Use the bounding box precomputed at load time
+        bounds = tuple(target_country[BOUNDS_COLUMNS].to_numpy()[0])
+    else:
+        # Calculate the bounding box of the target geometry
+        bounds = target_geom.bounds
     target_width = bounds[2] - bounds[0]
     target_height = bounds[3] - bounds[1]
 
@@ -67,13 +132,8 @@ def create_map(
     center_x = (bounds[0] + bounds[2]) / 2
     center_y = (bounds[1] + bounds[3]) / 2
 
-    # Determine the scaling factor to achieve the desired target percentage
-    # For a square view, the target percentage is based on area
-    # If target should occupy 30% of the area, the side length ratio is sqrt(0.3)
-    scale_factor = 1.0 / math.sqrt(config.target_percentage)
-
-    # Calculate the total size needed
-    total_size = target_size * scale_factor
+    # Calculate the total size needed to achieve the desired target percentage
+    total_size = target_size * config.scale_factor
 
     # Calculate the buffer needed on each side to center the target
     buffer_x = (total_size - target_width) / 2
@@ -109,12 +169,17 @@ def create_map(
         "other": config.colors.other_color,
     }
 
-    # Plot the countries
-    countries_copy.plot(
-        ax=ax,
-        color=countries_copy["country_type"].map(color_mapping),
-        edgecolor=config.colors.border_color,
-        linewidth=config.border_width,
+    # Plot the countries as a single collection of pre-flattened paths
+    paths, drawn = _build_country_paths(np.asarray(countries_copy.geometry))
+    face_colors = countries_copy["country_type"].map(color_mapping).to_numpy()
+    ax.add_collection(
+        PathCollection(
+            paths,
+            facecolors=face_colors[drawn],
+            edgecolors=config.colors.border_color,
+            linewidths=config.border_width,
+        ),
+        autolim=False,
     )
 
     # Set the background color (ocean)
@@ -211,8 +276,6 @@ def create_map(
     # Remove axes
     ax.set_axis_off()
 
-    # Save the figure
-    plt.savefig(config.output_path, dpi=config.dpi, bbox_inches="tight")
-
-    # Close the figure to free memory
-    plt.close(fig)
+    # Save the figure in the format given by the file extension; the figure is not
+    # registered with pyplot, so there is nothing to close
+    fig.savefig(config.output_path, dpi=config.dpi, bbox_inches="tight")
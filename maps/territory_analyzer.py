@@ -14,22 +14,37 @@ Examples include:
 - Indonesia: Island nation
 """
 
+import logging
 import os
 import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Union, cast
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
-import shapely.wkb as wkb
+import shapely
 from shapely.geometry import MultiPolygon, Polygon
 
+if TYPE_CHECKING:
+    # Only needed for annotations; analyze_all works on the frame it is given
+    import geopandas as gpd
+
+logger = logging.getLogger(__name__)
+
 # Type aliases
 CountryName = str
 DBPath = str
 GeometryType = Union[Polygon, MultiPolygon]
 TerritoryInfo = Dict[str, Any]
 
+# dataclass(slots=True) needs Python 3.10; on older interpreters results keep a __dict__
+_DATACLASS_SLOTS: Dict[str, bool] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
+
 
 class CountryGeometryType(Enum):
     """Enum representing different types of country geometries."""
@@ -39,11 +54,36 @@ class CountryGeometryType(Enum):
     HAS_EXCLAVE = "has_exclave"
 
 
-@dataclass
+def _empty_vector() -> np.ndarray:
+    """Return an empty float64 vector, used as a dataclass default."""
+    return np.empty(0, dtype=np.float64)
+
+
+def _empty_index_vector() -> np.ndarray:
+    """Return an empty integer index vector, used as a dataclass default."""
+    return np.empty(0, dtype=np.intp)
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class TerritoryAnalysisResult:
     """
     Class to hold the results of territory analysis.
 
+    Per-territory data is stored as parallel numpy arrays (one entry per polygon,
+    largest first) rather than one dictionary per polygon, which keeps the footprint
+    of island nations with thousands of polygons small and lets callers aggregate
+    with vectorized operations. The list-of-dicts view is only built on demand by
+    ``separate_territories``.
+
+    Centroids can be computed lazily: a result may hold a factory instead of the
+    array, which is only called the first time ``territory_centroids`` is accessed.
+    ``analyze`` does this for single Polygons only; for MultiPolygons the centroids
+    are needed up front for the distance between territories, so they are stored
+    directly.
+
+    Results are immutable and, where supported, slotted: a batch analysis creates one
+    per country, so they carry no per-instance ``__dict__``.
+
     Attributes:
         country_name: Name of the analyzed country
         geometry_type: Classification of the country's geometry (continuous, island nation, etc.)
@@ -52,7 +92,14 @@ class TerritoryAnalysisResult:
         main_polygon_percentage: Percentage of total area covered by the largest polygon
         polygon_count: Number of separate polygons
         max_distance_between_polygons: Maximum distance between any two polygons
-        separate_territories: List of dictionaries containing information about each territory
+        territory_areas: Area of each territory, shape (n,)
+        territory_percentages: Percentage of the total area of each territory, shape (n,)
+        territory_indices: Position of each territory among the parts of the analyzed
+                           geometry (shapely.get_parts order), shape (n,)
+        centroids: Centroid of each territory, shape (n, 2), if already computed
+        centroids_factory: Callable returning the territory centroids, shape (n, 2),
+                           used when centroids is None. If both are None, the result
+                           has no centroid information.
     """
 
     country_name: str
@@ -64,13 +111,167 @@ class TerritoryAnalysisResult:
     main_polygon_percentage: float = field(default=100.0)
     polygon_count: int = field(default=1)
     max_distance_between_polygons: float = field(default=0.0)
-    separate_territories: List[TerritoryInfo] = field(default_factory=list)
+    territory_areas: np.ndarray = field(default_factory=_empty_vector, compare=False)
+    territory_percentages: np.ndarray = field(
+        default_factory=_empty_vector, compare=False
+    )
+    territory_indices: np.ndarray = field(
+        default_factory=_empty_index_vector, compare=False
+    )
+    centroids: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    centroids_factory: Optional[Callable[[], np.ndarray]] = field(
+        default=None, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         """Initialize dependent fields after instance creation."""
         # If main_polygon_area is 0.0 (default), use total_area
         if self.main_polygon_area == 0.0:
-            self.main_polygon_area = self.total_area
+            object.__setattr__(self, "main_polygon_area", self.total_area)
+
+    @property
+    def territory_centroids(self) -> np.ndarray:
+        """
+        Centroid of each territory, built from centroids_factory on first access if
+        they were not given as centroids.
+
+        Returns:
+            Array of shape (n, 2) with the (x, y) centroid of each territory
+        """
+        if self.centroids is None:
+            factory = self.centroids_factory
+            # The cache is not part of the value, so it is filled despite frozen=True
+            object.__setattr__(
+                self,
+                "centroids",
+                factory()
+                if factory is not None
+                else np.empty((len(self.territory_areas), 2), dtype=np.float64),
+            )
+        centroids = self.centroids
+        assert centroids is not None
+        return centroids
+
+    @property
+    def separate_territories(self) -> List[TerritoryInfo]:
+        """
+        Information about each territory as dictionaries, largest first.
+
+        This view is meant for output boundaries (printing, JSON); it is rebuilt on
+        every access, so prefer the array attributes for computations.
+
+        Returns:
+            List of dictionaries with 'area', 'percentage' and 'centroid' keys
+        """
+        if len(self.territory_areas) == 0:
+            return []
+        return [
+            {
+                "area": float(area),
+                "percentage": float(percentage),
+                "centroid": (float(x), float(y)),
+            }
+            for area, percentage, (x, y) in zip(
+                self.territory_areas,
+                self.territory_percentages,
+                self.territory_centroids,
+            )
+        ]
+
+
+# Below this many centroids, comparing every pair is cheaper than building their hull
+_HULL_MIN_POINTS = 16
+
+
+def _max_centroid_distance(centroid_xy: np.ndarray) -> float:
+    """
+    Compute the maximum pairwise Euclidean distance between centroids.
+
+    The farthest pair of points always lies on their convex hull, so for larger sets
+    only the hull vertices (found with one GEOS call) are compared. The pairs are
+    scanned one row at a time so that only an O(n) temporary is allocated per row,
+    instead of materializing the full (n, n, 2) difference tensor. Squared distances
+    are compared in the inner step and a single square root is taken at the end.
+
+    Args:
+        centroid_xy: Array of shape (n, 2) holding the (x, y) coordinates of each centroid
+
+    Returns:
+        Maximum distance between any two centroids, or 0.0 if there are fewer than two
+    """
+    if centroid_xy.shape[0] > _HULL_MIN_POINTS and np.isfinite(centroid_xy).all():
+        centroid_xy = shapely.get_coordinates(
+            shapely.convex_hull(shapely.multipoints(centroid_xy))
+        )
+
+    max_distance_sq = 0.0
+    for i in range(centroid_xy.shape[0] - 1):
+        deltas = centroid_xy[i + 1 :] - centroid_xy[i]
+        row_max = float(np.max(np.einsum("ij,ij->i", deltas, deltas)))
+        if row_max > max_distance_sq:
+            max_distance_sq = row_max
+    return float(np.sqrt(max_distance_sq))
+
+
+# Classification codes produced by _classify_geometry_types, indexing _GEOMETRY_TYPES
+_GEOMETRY_TYPES = (
+    CountryGeometryType.CONTINUOUS,
+    CountryGeometryType.HAS_EXCLAVE,
+    CountryGeometryType.ISLAND_NATION,
+)
+
+
+def _classify_geometry_types(
+    polygon_counts: np.ndarray, main_percentages: np.ndarray, threshold: float
+) -> np.ndarray:
+    """
+    Classify many countries at once from their polygon counts and main polygon shares.
+
+    Applies the same rule as ``TerritoryAnalyzer.analyze``: a single polygon is
+    continuous, a dominant main polygon means exclaves, anything else is an island
+    nation.
+
+    Args:
+        polygon_counts: Number of polygons of each country, shape (n,)
+        main_percentages: Percentage of each country's area covered by its largest
+                          polygon, shape (n,)
+        threshold: Fraction of the total area above which the main polygon is dominant
+
+    Returns:
+        Integer codes of shape (n,), indexing into _GEOMETRY_TYPES
+    """
+    return np.where(
+        polygon_counts == 1,
+        0,
+        np.where(main_percentages >= threshold * 100, 1, 2),
+    )
+
+
+# SQLite tuning for the read-only geometry queries: memory-map up to 256 MiB of the
+# database file and allow a ~512 MiB page cache (negative sizes are in KiB)
+_SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+_SQLITE_CACHE_SIZE_KIB = 512 * 1000
+
+
+def _connect_readonly(db_path: DBPath) -> sqlite3.Connection:
+    """
+    Open the Natural Earth database read-only and tuned for large geometry reads.
+
+    The database is opened through a ``mode=ro`` URI, so no journal or lock files are
+    created and any number of processes (e.g. parallel test workers) can read it at
+    once. Memory-mapped I/O lets those processes share the OS page cache for the file.
+
+    Args:
+        db_path: Path to the Natural Earth SQLite database
+
+    Returns:
+        Open read-only SQLite connection
+    """
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    conn.execute(f"PRAGMA mmap_size={_SQLITE_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size=-{_SQLITE_CACHE_SIZE_KIB}")
+    return conn
 
 
 def load_country_geometry(
@@ -92,44 +293,111 @@ def load_country_geometry(
         ValueError: If the country isn't found in the database
         TypeError: If the geometry is not a Polygon or MultiPolygon
     """
-    # Verify database exists
-    if not os.path.exists(db_path):
-        raise FileNotFoundError(f"Database file not found: {db_path}")
+    # Share the batch loader's query and vectorized WKB decoding
+    geometries = load_country_geometries([country_name], db_path)
 
-    conn = None
-    try:
-        # Connect to the SQLite database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Execute query with parameter
-        cursor.execute(
-            "SELECT GEOMETRY FROM ne_10m_admin_0_countries WHERE name = ?",
-            (country_name,),
+    # Check if country was found
+    if country_name not in geometries:
+        raise ValueError(f"Country '{country_name}' not found in the database")
+
+    return geometries[country_name]
+
+
+def load_country_geometries(
+    country_names: Optional[List[CountryName]] = None,
+    db_path: DBPath = "natural_earth_vector.sqlite",
+) -> Dict[CountryName, GeometryType]:
+    """
+    Load the geometries of several countries from the Natural Earth database at once.
+
+    All requested rows are fetched with a single query and their WKB blobs are decoded
+    in one vectorized ``shapely.from_wkb`` call, instead of one ``wkb.loads`` call per
+    country. This is the preferred entry point when many countries are analyzed in a row.
+
+    Args:
+        country_names: Names of the countries to load. If None, all countries are loaded.
+        db_path: Path to the Natural Earth SQLite database
+
+    Returns:
+        Dictionary mapping country names to their geometries (Polygon or MultiPolygon).
+        Countries that are not present in the database are omitted from the result.
+
+    Raises:
+        FileNotFoundError: If the database file doesn't exist
+        TypeError: If a geometry is not a Polygon or MultiPolygon
+    """
+    return {
+        name: _check_geometry_type(name, geometry)
+        for name, geometry in _fetch_country_geometries(country_names, db_path).items()
+    }
+
+
+def _check_geometry_type(country_name: CountryName, geometry: Any) -> GeometryType:
+    """
+    Ensure a decoded country geometry is a Polygon or MultiPolygon.
+
+    Args:
+        country_name: Name of the country, for the error message
+        geometry: Decoded geometry of the country
+
+    Returns:
+        The geometry, unchanged
+
+    Raises:
+        TypeError: If the geometry is not a Polygon or MultiPolygon
+    """
+    if not isinstance(geometry, (Polygon, MultiPolygon)):
+        raise TypeError(
+            f"Expected Polygon or MultiPolygon for '{country_name}', "
+            f"got {type(geometry).__name__}"
         )
+    return geometry
 
-        # Fetch the result
-        result = cursor.fetchone()
 
-        # Check if country was found
-        if result is None:
-            raise ValueError(f"Country '{country_name}' not found in the database")
+def _fetch_country_geometries(
+    country_names: Optional[List[CountryName]], db_path: DBPath
+) -> Dict[CountryName, Any]:
+    """
+    Fetch and decode the geometries of several countries, without checking their types.
 
-        # Convert the BLOB geometry to shapely geometry
-        geometry = wkb.loads(result[0])
+    Args:
+        country_names: Names of the countries to load. If None, all countries are loaded.
+        db_path: Path to the Natural Earth SQLite database
 
-        # Ensure the geometry is of the expected type
-        if not isinstance(geometry, (Polygon, MultiPolygon)):
-            raise TypeError(
-                f"Expected Polygon or MultiPolygon, got {type(geometry).__name__}"
-            )
+    Returns:
+        Dictionary mapping the names of the countries found to their decoded geometries
 
-        return cast(GeometryType, geometry)
+    Raises:
+        FileNotFoundError: If the database file doesn't exist
+    """
+    # Verify database exists
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database file not found: {db_path}")
+
+    if country_names is not None and not country_names:
+        return {}
+
+    query = "SELECT name, GEOMETRY FROM ne_10m_admin_0_countries"
+    params: tuple[str, ...] = ()
+    if country_names is not None:
+        placeholders = ", ".join("?" for _ in country_names)
+        query = f"{query} WHERE name IN ({placeholders})"
+        params = tuple(country_names)
 
+    conn = None
+    try:
+        conn = _connect_readonly(db_path)
+        rows = conn.execute(query, params).fetchall()
     finally:
         if conn is not None:
             conn.close()
 
+    # Decode all BLOB geometries in a single vectorized call
+    blobs = np.array([row[1] for row in rows], dtype=object)
+    geometries = shapely.from_wkb(blobs)
+
+    return {name: geometry for (name, _), geometry in zip(rows, geometries)}
+
 
 class TerritoryAnalyzer:
     """
@@ -155,21 +423,45 @@ class TerritoryAnalyzer:
         self.main_area_threshold = main_area_threshold
 
     def analyze(
-        self, country_name: str, geometry: GeometryType
+        self,
+        country_name: str,
+        geometry: GeometryType,
+        *,
+        areas: Optional[np.ndarray] = None,
+        centroids: Optional[np.ndarray] = None,
+        geometry_type: Optional[CountryGeometryType] = None,
     ) -> TerritoryAnalysisResult:
         """
         Analyze a country's geometry and classify it.
 
+        Per-polygon areas and centroids can be passed in when they have already been
+        computed in bulk (see ``analyze_all``), in which case no GEOS call is made for
+        them here. Both arrays must follow the order of ``geometry.geoms`` (a single
+        Polygon counts as one part). Likewise, a classification computed in bulk can be
+        passed as ``geometry_type``.
+
         Args:
             country_name: Name of the country
             geometry: Shapely geometry (Polygon or MultiPolygon) of the country
+            areas: Optional array of shape (n,) with the area of each polygon
+            centroids: Optional array of shape (n, 2) with the centroid of each polygon
+            geometry_type: Optional precomputed classification of the country
 
         Returns:
             TerritoryAnalysisResult with analysis data
+
+        Raises:
+            ValueError: If the precomputed arrays don't match the number of polygons
         """
         # Handle single polygon case
         if isinstance(geometry, Polygon):
-            area = geometry.area
+            area = float(areas[0]) if areas is not None else geometry.area
+
+            def single_centroid() -> np.ndarray:
+                if centroids is not None:
+                    return np.asarray(centroids, dtype=np.float64).reshape(1, 2)
+                return np.asarray(shapely.get_coordinates(geometry.centroid), dtype=np.float64)
+
             return TerritoryAnalysisResult(
                 country_name=country_name,
                 geometry_type=CountryGeometryType.CONTINUOUS,
@@ -178,67 +470,55 @@ class TerritoryAnalyzer:
                 main_polygon_percentage=100.0,
                 polygon_count=1,
                 max_distance_between_polygons=0.0,
-                separate_territories=[
-                    {
-                        "area": area,
-                        "percentage": 100.0,
-                        "centroid": (geometry.centroid.x, geometry.centroid.y),
-                    }
-                ],
+                territory_areas=np.array([area], dtype=np.float64),
+                territory_percentages=np.array([100.0], dtype=np.float64),
+                territory_indices=np.zeros(1, dtype=np.intp),
+                centroids_factory=single_centroid,
             )
 
         # For MultiPolygon case
-        polygons = list(geometry.geoms)
+        polygons = shapely.get_parts(geometry)
         polygon_count = len(polygons)
 
-        # Calculate areas and sort polygons by area (largest first)
-        areas = [p.area for p in polygons]
-        total_area = sum(areas)
+        # Calculate areas and centroids for all polygons in bulk unless provided
+        if areas is None:
+            areas = shapely.area(polygons)
+        if centroids is None:
+            centroids = shapely.get_coordinates(shapely.centroid(polygons))
+        if len(areas) != polygon_count or len(centroids) != polygon_count:
+            raise ValueError(
+                f"Expected {polygon_count} precomputed areas and centroids, "
+                f"got {len(areas)} and {len(centroids)}"
+            )
+
+        # Sort polygons by area (largest first)
+        total_area = float(np.sum(areas))
         sorted_indices = np.argsort(areas)[::-1]  # Descending order
 
         # Get the main polygon (largest by area)
-        main_polygon = polygons[sorted_indices[0]]
-        main_polygon_area = main_polygon.area
+        main_polygon_area = float(areas[sorted_indices[0]])
         main_polygon_percentage = (main_polygon_area / total_area) * 100.0
 
-        # Calculate territory information
-        territories: List[TerritoryInfo] = []
-        for i in sorted_indices:
-            polygon = polygons[i]
-            area = polygon.area
-            percentage = (area / total_area) * 100.0
-            centroid = polygon.centroid
-
-            territories.append(
-                {
-                    "area": area,
-                    "percentage": percentage,
-                    "centroid": (centroid.x, centroid.y),
-                }
-            )
+        # Calculate territory information as arrays ordered largest first
+        territory_areas = np.asarray(areas, dtype=np.float64)[sorted_indices]
+        territory_percentages = (territory_areas / total_area) * 100.0
+        territory_centroids = np.asarray(centroids, dtype=np.float64)[sorted_indices]
 
         # Calculate maximum distance between polygons
-        max_distance = 0.0
-        if polygon_count > 1:
-            for i in range(polygon_count):
-                for j in range(i + 1, polygon_count):
-                    # Use distance between centroids for simplicity and efficiency
-                    # More sophisticated approaches would use the actual minimum distance between polygons
-                    p1_centroid = polygons[i].centroid
-                    p2_centroid = polygons[j].centroid
-                    distance = p1_centroid.distance(p2_centroid)
-                    max_distance = max(max_distance, distance)
-
-        # Determine geometry type
-        geometry_type: CountryGeometryType
-        if polygon_count == 1:
-            geometry_type = CountryGeometryType.CONTINUOUS
-        elif main_polygon_percentage >= (self.main_area_threshold * 100):
-            # If the main landmass is significant (e.g. >80% of area)
-            geometry_type = CountryGeometryType.HAS_EXCLAVE
-        else:
-            # If no single landmass is dominant (like an island nation)
-            geometry_type = CountryGeometryType.ISLAND_NATION
+        # Use distance between centroids for simplicity and efficiency
+        # More sophisticated approaches would use the actual minimum distance between polygons
+        max_distance = _max_centroid_distance(territory_centroids)
+
+        # Determine geometry type unless it was classified in bulk
+        if geometry_type is None:
+            if polygon_count == 1:
+                geometry_type = CountryGeometryType.CONTINUOUS
+            elif main_polygon_percentage >= (self.main_area_threshold * 100):
+                # If the main landmass is significant (e.g. >80% of area)
+                geometry_type = CountryGeometryType.HAS_EXCLAVE
+            else:
+                # If no single landmass is dominant (like an island nation)
+                geometry_type = CountryGeometryType.ISLAND_NATION
 
         # Create and return result
         return TerritoryAnalysisResult(
@@ -249,9 +529,70 @@ class TerritoryAnalyzer:
             main_polygon_percentage=main_polygon_percentage,
             polygon_count=polygon_count,
             max_distance_between_polygons=max_distance,
-            separate_territories=territories,
+            territory_areas=territory_areas,
+            territory_percentages=territory_percentages,
+            territory_indices=sorted_indices,
+            centroids=territory_centroids,
         )
 
+    def analyze_all(self, countries: "gpd.GeoDataFrame") -> List[TerritoryAnalysisResult]:
+        """
+        Analyze every country of a GeoDataFrame in one batch.
+
+        The geometries of all countries are split into their polygons and the areas
+        and centroids of every polygon are computed with two vectorized shapely calls.
+        The resulting contiguous arrays are then sliced per country and handed to
+        ``analyze``, so no per-polygon GEOS round-trips happen inside the loop. The
+        countries are also classified together, with one vectorized comparison over
+        their polygon counts and main polygon shares.
+
+        Args:
+            countries: GeoDataFrame with a 'name' column and Polygon/MultiPolygon geometries
+
+        Returns:
+            List of TerritoryAnalysisResult, in the row order of the GeoDataFrame.
+            Rows without a geometry are skipped.
+        """
+        geometries = countries.geometry.to_numpy()
+        parts, owners = shapely.get_parts(geometries, return_index=True)
+
+        # Compute per-polygon attributes for the whole table at once
+        areas = shapely.area(parts)
+        centroids = shapely.get_coordinates(shapely.centroid(parts))
+
+        # Parts of one country are contiguous, so offsets delimit each country's slice
+        counts = np.bincount(owners, minlength=len(geometries))
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+
+        # Classify every country with parts; their slices tile the parts array exactly
+        present = counts > 0
+        codes = np.zeros(len(geometries), dtype=np.intp)
+        if present.any():
+            starts = offsets[:-1][present]
+            main_percentages = (
+                np.maximum.reduceat(areas, starts) / np.add.reduceat(areas, starts)
+            ) * 100.0
+            codes[present] = _classify_geometry_types(
+                counts[present], main_percentages, self.main_area_threshold
+            )
+
+        results: List[TerritoryAnalysisResult] = []
+        for row, (name, geometry) in enumerate(zip(countries["name"], geometries)):
+            if counts[row] == 0:
+                continue
+            start, stop = offsets[row], offsets[row + 1]
+            results.append(
+                self.analyze(
+                    name,
+                    geometry,
+                    areas=areas[start:stop],
+                    centroids=centroids[start:stop],
+                    geometry_type=_GEOMETRY_TYPES[codes[row]],
+                )
+            )
+
+        return results
+
     def analyze_from_db(
         self, country_name: str, db_path: str = "natural_earth_vector.sqlite"
     ) -> TerritoryAnalysisResult:
@@ -268,11 +609,102 @@ class TerritoryAnalyzer:
         geometry = load_country_geometry(country_name, db_path)
         return self.analyze(country_name, geometry)
 
+    def analyze_from_db_batch(
+        self,
+        country_names: List[str],
+        db_path: str = "natural_earth_vector.sqlite",
+        max_workers: Optional[int] = None,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> Iterator[Tuple[str, TerritoryAnalysisResult]]:
+        """
+        Load several countries from the database at once and analyze them one by one.
+
+        The database is opened once and all geometries are fetched with a single
+        query; the analysis itself is done lazily as the returned iterator is consumed.
+
+        Shapely 2 releases the GIL inside its vectorized GEOS operations, so with
+        max_workers > 1 the countries are analyzed concurrently on a thread pool.
+        Results are still yielded in the order of country_names.
+
+        Each country is analyzed on its own: a country that is missing, has an
+        unexpected geometry type or fails to analyze is reported to on_error and
+        skipped, and the remaining countries are still analyzed.
+
+        Args:
+            country_names: Names of the countries to analyze
+            db_path: Path to the Natural Earth SQLite database
+            max_workers: Number of threads to analyze countries with. If None or 1,
+                         countries are analyzed sequentially in the calling thread.
+            on_error: Called with the country name and the exception for every country
+                      that could not be analyzed, in the order of country_names.
+                      By default the failure is logged.
+
+        Yields:
+            Tuples of (country name, TerritoryAnalysisResult), in the order of
+            country_names, for the countries that were analyzed successfully
+
+        Raises:
+            FileNotFoundError: If the database file doesn't exist
+        """
+        if on_error is None:
+            on_error = _log_analysis_error
+        geometries = _fetch_country_geometries(country_names, db_path)
+
+        def analyze_one(name: str) -> Union[TerritoryAnalysisResult, Exception]:
+            # Failures are returned rather than raised, so one country cannot abort
+            # the iteration over the others
+            try:
+                if name not in geometries:
+                    raise ValueError(f"Country '{name}' not found in the database")
+                return self.analyze(name, _check_geometry_type(name, geometries[name]))
+            except Exception as e:
+                return e
+
+        if max_workers is None or max_workers <= 1 or len(country_names) <= 1:
+            outcomes: Iterator[Union[TerritoryAnalysisResult, Exception]] = map(
+                analyze_one, country_names
+            )
+            yield from _successful_results(country_names, outcomes, on_error)
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outcomes = executor.map(analyze_one, country_names)
+            yield from _successful_results(country_names, outcomes, on_error)
+
+
+def _log_analysis_error(country_name: str, error: Exception) -> None:
+    """Log a country that could not be analyzed; the default batch error handler."""
+    logger.error("Error analyzing %s: %s", country_name, error)
+
+
+def _successful_results(
+    country_names: List[str],
+    outcomes: Iterator[Union[TerritoryAnalysisResult, Exception]],
+    on_error: Callable[[str, Exception], None],
+) -> Iterator[Tuple[str, TerritoryAnalysisResult]]:
+    """
+    Yield the analyzed countries and report the failed ones, in the order given.
+
+    Args:
+        country_names: Names of the countries, in the order of outcomes
+        outcomes: Analysis result or raised exception of each country
+        on_error: Called with the name and exception of each failed country
+
+    Yields:
+        Tuples of (country name, TerritoryAnalysisResult) for the successful countries
+    """
+    for name, outcome in zip(country_names, outcomes):
+        if isinstance(outcome, Exception):
+            on_error(name, outcome)
+        else:
+            yield name, outcome
+
 
 def get_country_territory_info(
     country_name: str,
     db_path: str = "natural_earth_vector.sqlite",
     threshold: float = 0.8,
+    include_territories: bool = True,
 ) -> dict:
     """
     Analyze a country's territory and return a dictionary with territory information.
@@ -284,6 +716,8 @@ def get_country_territory_info(
         country_name: Name of the country to analyze
         db_path: Path to the Natural Earth SQLite database
         threshold: Threshold for determining if a polygon is dominant (default: 0.8)
+        include_territories: Whether to include the per-territory breakdown. Callers that
+                             only need the classification can pass False to skip building it.
 
     Returns:
         Dictionary with territory information including:
@@ -293,26 +727,38 @@ def get_country_territory_info(
         - has_exclaves: Boolean indicating if the country has exclaves
         - is_island_nation: Boolean indicating if the country is an island nation
         - max_distance: Maximum distance between any two polygons
+        - territories: Area, percentage, coordinates and part index of each territory,
+                       largest first (only present if include_territories is True). The
+                       index is the territory's position in the country's MultiPolygon.
     """
     analyzer = TerritoryAnalyzer(main_area_threshold=threshold)
     result = analyzer.analyze_from_db(country_name, db_path)
 
-    territory_info = {
+    territory_info: Dict[str, Any] = {
         "territory_type": result.geometry_type.value,
         "polygon_count": result.polygon_count,
         "main_area_percentage": result.main_polygon_percentage,
         "has_exclaves": result.geometry_type == CountryGeometryType.HAS_EXCLAVE,
         "is_island_nation": result.geometry_type == CountryGeometryType.ISLAND_NATION,
         "max_distance": result.max_distance_between_polygons,
-        "territories": [
+    }
+
+    if include_territories:
+        # Convert the territory arrays to plain Python values at the output boundary
+        territory_info["territories"] = [
             {
-                "area": t["area"],
-                "percentage": t["percentage"],
-                "coordinates": t["centroid"],
+                "area": area,
+                "percentage": percentage,
+                "coordinates": (x, y),
+                "index": index,
             }
-            for t in result.separate_territories
-        ],
-    }
+            for area, percentage, (x, y), index in zip(
+                result.territory_areas.tolist(),
+                result.territory_percentages.tolist(),
+                result.territory_centroids.tolist(),
+                result.territory_indices.tolist(),
+            )
+        ]
 
     return territory_info
 
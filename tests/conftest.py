@@ -1,21 +1,93 @@
 """Shared test fixtures for the maps package."""
 
+from __future__ import annotations
+
 import os
-from typing import Any, Generator
+import sqlite3
+from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING, Any, Generator, List, Optional
 from unittest.mock import MagicMock, patch
 
-import geopandas as gpd
-import pandas as pd
 import pytest
-from shapely.geometry import Polygon
+from packaging.version import Version
+
+if TYPE_CHECKING:
+    # Imported inside the fixtures, so collection does not load the geodata stack
+    import geopandas as gpd
+    import pandas as pd
+    from shapely.geometry import Polygon
+
+# Oldest geodata stack whose vectorized GEOS functions the geo tests exercise; on older
+# stacks those tests are skipped rather than run through slow or missing code paths
+_GEO_MIN_VERSIONS = {"shapely": "2.0", "geopandas": "0.13"}
+_GEO_MIN_GEOS_VERSION = (3, 10, 0)
 
 # Constants for testing
 TEST_DB_PATH = "test_natural_earth_vector.sqlite"
 
+# Rows returned by the list_country_names query, in (name, name_long, iso_a3) order
+COUNTRY_NAME_COLUMNS = ["name", "name_long", "iso_a3"]
+COUNTRY_NAME_ROWS = [
+    ("Germany", "Federal Republic of Germany", "DEU"),
+    ("France", "French Republic", "FRA"),
+    ("Spain", "Kingdom of Spain", "ESP"),
+    ("Italy", "Italian Republic", "ITA"),
+    ("Portugal", "Portuguese Republic", "PRT"),
+]
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the custom markers used by the test suite."""
+    config.addinivalue_line(
+        "markers", "cli: command-line interface tests with every collaborator mocked out"
+    )
+    config.addinivalue_line(
+        "markers", "geo: tests that build real geopandas/shapely data and load geopandas"
+    )
+
+
+def _geo_stack_skip_reason() -> Optional[str]:
+    """
+    Check the installed geodata stack against the minimum versions of the geo tests.
+
+    Package versions are read from their metadata, so geopandas is not imported.
+
+    Returns:
+        Why the geo tests cannot run, or None if the stack is recent enough
+    """
+    for package, minimum in _GEO_MIN_VERSIONS.items():
+        try:
+            installed = version(package)
+        except PackageNotFoundError:
+            return f"{package} is not installed"
+        if Version(installed) < Version(minimum):
+            return f"{package} >= {minimum} is required, found {installed}"
+
+    import shapely
+
+    if shapely.geos_version < _GEO_MIN_GEOS_VERSION:
+        return f"GEOS >= 3.10 is required, found {shapely.geos_version_string}"
+    return None
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item]) -> None:
+    """Skip the geo tests when the installed geodata stack is too old."""
+    geo_items = [item for item in items if item.get_closest_marker("geo")]
+    if not geo_items:
+        return
+
+    reason = _geo_stack_skip_reason()
+    if reason is not None:
+        skip = pytest.mark.skip(reason=reason)
+        for item in geo_items:
+            item.add_marker(skip)
+
 
 @pytest.fixture(scope="session")
 def sample_polygons() -> dict[str, Polygon]:
     """Provide sample polygons for testing."""
+    from shapely.geometry import Polygon
+
     return {
         "germany": Polygon([(10, 50), (10, 55), (15, 55), (15, 50)]),
         "france": Polygon([(5, 45), (5, 50), (10, 50), (10, 45)]),
@@ -34,17 +106,37 @@ def mock_database_exists() -> Generator[MagicMock, None, None]:
 
 
 @pytest.fixture
-def mock_db_connection() -> Generator[MagicMock, None, None]:
-    """Mock sqlite3.connect to return a mock connection."""
+def mock_conn_cursor() -> tuple[MagicMock, MagicMock]:
+    """
+    Provide a mock sqlite3 connection whose cursor() returns a mock cursor.
+
+    Both mocks are specced, so they only expose the attributes of the real sqlite3
+    classes and misspelled calls fail instead of passing silently.
+
+    Returns:
+        Tuple of the (connection, cursor) mocks
+    """
+    mock_conn = MagicMock(spec=sqlite3.Connection)
+    mock_cursor = MagicMock(spec=sqlite3.Cursor)
+    mock_conn.cursor.return_value = mock_cursor
+    return mock_conn, mock_cursor
+
+
+@pytest.fixture
+def mock_db_connection(
+    mock_conn_cursor: tuple[MagicMock, MagicMock],
+) -> Generator[MagicMock, None, None]:
+    """Mock sqlite3.connect to return the connection from mock_conn_cursor."""
     with patch("sqlite3.connect") as mock_connect:
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
+        mock_connect.return_value = mock_conn_cursor[0]
         yield mock_connect
 
 
 @pytest.fixture
 def sample_countries_dataframe(sample_polygons: dict[str, Polygon]) -> pd.DataFrame:
     """Create a sample countries DataFrame for testing."""
+    import pandas as pd
+
     return pd.DataFrame({
         "name": ["Germany", "France", "Poland", "Belgium", "Netherlands"],
         "name_long": [
@@ -59,9 +151,24 @@ def sample_countries_dataframe(sample_polygons: dict[str, Polygon]) -> pd.DataFr
     })
 
 
+@pytest.fixture(scope="session")
+def country_names_df() -> pd.DataFrame:
+    """
+    Provide the rows list_country_names reads from ne_10m_admin_0_countries.
+
+    Built once per session; tests hand out shallow copies (or slices) so the shared
+    frame is never modified in place.
+    """
+    import pandas as pd
+
+    return pd.DataFrame.from_records(COUNTRY_NAME_ROWS, columns=COUNTRY_NAME_COLUMNS)
+
+
 @pytest.fixture
 def sample_countries_geodataframe(sample_polygons: dict[str, Polygon]) -> gpd.GeoDataFrame:
     """Create a sample countries GeoDataFrame for testing."""
+    import geopandas as gpd
+
     return gpd.GeoDataFrame({
         "name": ["Germany", "France", "Poland", "Belgium", "Netherlands"],
         "name_long": [
@@ -92,30 +199,3 @@ def sample_neighbors_result() -> list[tuple[str, str]]:
         ("Belgium", "BEL"),
         ("Netherlands", "NLD"),
     ]
-
-
-@pytest.fixture
-def mock_matplotlib() -> Generator[dict[str, MagicMock], None, None]:
-    """Mock matplotlib.pyplot to avoid actual plotting."""
-    mocks = {}
-    
-    with patch("matplotlib.pyplot.subplots") as mock_subplots:
-        mock_fig = MagicMock()
-        mock_ax = MagicMock()
-        mock_subplots.return_value = (mock_fig, mock_ax)
-        mocks["subplots"] = mock_subplots
-        mocks["fig"] = mock_fig
-        mocks["ax"] = mock_ax
-        
-        with patch("matplotlib.pyplot.savefig") as mock_savefig:
-            mocks["savefig"] = mock_savefig
-            
-            with patch("matplotlib.pyplot.close") as mock_close:
-                mocks["close"] = mock_close
-                
-                with patch("matplotlib.pyplot.text") as mock_text:
-                    mocks["text"] = mock_text
-                    
-                    with patch("matplotlib.pyplot.title") as mock_title:
-                        mocks["title"] = mock_title
-                        yield mocks 
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Shared test fixtures for the maps test modules.
+
+Geometry libraries are imported inside the fixtures, so they are only loaded when a
+test actually requests one of them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+from unittest.mock import MagicMock, Mock, sentinel
+
+import pytest
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+    from pandas import DataFrame
+    from shapely.geometry import Polygon
+
+
+@pytest.fixture(scope="module")
+def main_polygon() -> Polygon:
+    """Provide the main landmass of a test country (area 100)."""
+    from shapely.geometry import Polygon
+
+    return Polygon([(0, 0), (0, 10), (10, 10), (10, 0)])
+
+
+@pytest.fixture(scope="module")
+def small_polygon() -> Polygon:
+    """Provide a small exclave of a test country (area 1)."""
+    from shapely.geometry import Polygon
+
+    return Polygon([(20, 20), (20, 21), (21, 21), (21, 20)])
+
+
+@pytest.fixture(scope="module")
+def multi_poly_gdf(main_polygon: Polygon, small_polygon: Polygon) -> gpd.GeoDataFrame:
+    """
+    Provide a single-country GeoDataFrame with a main landmass and an exclave.
+
+    The frame is shared across the module, so tests must not modify it in place.
+    """
+    import geopandas as gpd
+    from shapely.geometry import MultiPolygon
+
+    return gpd.GeoDataFrame(
+        {
+            "name": ["TestCountry"],
+            "geometry": [MultiPolygon([main_polygon, small_polygon])],
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def single_poly_gdf(main_polygon: Polygon) -> gpd.GeoDataFrame:
+    """
+    Provide a single-country GeoDataFrame with one contiguous polygon.
+
+    The frame is shared across the module, so tests must not modify it in place.
+    """
+    import geopandas as gpd
+
+    return gpd.GeoDataFrame({"name": ["TestCountry"], "geometry": [main_polygon]})
+
+
+@pytest.fixture
+def set_argv() -> Iterator[Callable[[list[str]], None]]:
+    """
+    Provide a setter for the command line seen by argparse.
+
+    sys.argv is saved once and restored on teardown, so tests can assign it directly
+    instead of registering a monkeypatch undo for every call.
+
+    Yields:
+        Function that replaces sys.argv with the given arguments
+    """
+    saved = sys.argv
+
+    def _set_argv(argv: list[str]) -> None:
+        sys.argv = list(argv)
+
+    yield _set_argv
+    sys.argv = saved
+
+
+@pytest.fixture(scope="session")
+def default_map_args() -> argparse.Namespace:
+    """Parse the command line 'maps/cli.py Germany' once per session."""
+    from maps.cli import parse_args
+
+    return parse_args(["Germany"])
+
+
+@pytest.fixture
+def parsed_args(
+    monkeypatch: pytest.MonkeyPatch, default_map_args: argparse.Namespace
+) -> Callable[..., argparse.Namespace]:
+    """
+    Provide a function that hands main() already parsed arguments.
+
+    For tests that are not about argument parsing: maps.cli.parse_args is replaced, so
+    main() skips argparse and sees the default map arguments with the given overrides.
+
+    Returns:
+        Function taking attribute overrides and returning the namespace main() will see
+    """
+    import maps.cli as cli
+
+    def _parsed_args(**overrides: Any) -> argparse.Namespace:
+        args = argparse.Namespace(**{**vars(default_map_args), **overrides})
+        monkeypatch.setattr(cli, "parse_args", lambda: args)
+        return args
+
+    return _parsed_args
+
+
+@pytest.fixture(scope="session")
+def load_return() -> tuple[Any, Any, list[str]]:
+    """
+    Provide the (countries, target_country, neighbor_names) loaded by the CLI tests.
+
+    main and generate_map only pass the frames on to the mocked create_map, so opaque
+    sentinels stand in for them. Built once per session, so tests must not modify it.
+    """
+    return sentinel.countries, sentinel.target_country, ["France", "Poland"]
+
+
+@pytest.fixture
+def patched_cli(
+    monkeypatch: pytest.MonkeyPatch,
+    load_return: tuple[Any, Any, list[str]],
+) -> SimpleNamespace:
+    """
+    Replace the data loading, territory analysis and rendering used by maps.cli.
+
+    The already-imported maps.cli attributes are swapped with monkeypatch, so tests
+    only configure return values instead of stacking patch decorators. By default
+    a continuous country with two neighbors is loaded (see load_return).
+
+    Returns:
+        Namespace with the load_country_data, get_country_territory_info and
+        create_map mocks
+    """
+    import maps.cli as cli
+
+    mocks = SimpleNamespace(
+        load_country_data=MagicMock(return_value=load_return),
+        get_country_territory_info=MagicMock(
+            return_value={
+                "territory_type": "continuous",
+                "polygon_count": 1,
+                "main_area_percentage": 100.0,
+                "has_exclaves": False,
+                "is_island_nation": False,
+                "max_distance": 0.0,
+                "territories": [
+                    {
+                        "area": 1.0,
+                        "percentage": 100.0,
+                        "coordinates": (0.0, 0.0),
+                        "index": 0,
+                    }
+                ],
+            }
+        ),
+        create_map=MagicMock(),
+    )
+    for name, mock in vars(mocks).items():
+        monkeypatch.setattr(cli, name, mock)
+    return mocks
+
+
+@pytest.fixture
+def patched_draw_map_db(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """
+    Replace the file system, database and neighbor lookups used by load_country_data.
+
+    By default the database exists and Germany's neighbors are France and Belgium;
+    tests pass the rows the query should return to set_rows.
+
+    load_country_data uses none of the magic methods, so plain Mocks are used; they are
+    cheaper to create than MagicMocks, which preconfigure every magic method.
+
+    Returns:
+        Namespace with the exists, connect, execute and get_neighboring_countries
+        mocks, and a set_rows function taking the query result as a DataFrame
+    """
+    connect = Mock()
+    execute = connect.return_value.execute
+    cursor = execute.return_value
+
+    def set_rows(rows: DataFrame) -> None:
+        # DB-API descriptions are 7-tuples whose first item is the column name
+        cursor.description = tuple((column,) + (None,) * 6 for column in rows.columns)
+        cursor.fetchall.return_value = list(rows.itertuples(index=False, name=None))
+
+    mocks = SimpleNamespace(
+        exists=Mock(return_value=True),
+        connect=connect,
+        execute=execute,
+        set_rows=set_rows,
+        get_neighboring_countries=Mock(return_value=[("France", "FRA"), ("Belgium", "BEL")]),
+    )
+    monkeypatch.setattr("os.path.exists", mocks.exists)
+    monkeypatch.setattr("sqlite3.connect", mocks.connect)
+    monkeypatch.setattr("maps.draw_map.get_neighboring_countries", mocks.get_neighboring_countries)
+    return mocks
@@ -1,55 +1,178 @@
 """Tests for CLI module functionality."""
 
-from unittest.mock import MagicMock, patch
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+from unittest.mock import DEFAULT, patch, sentinel
 
-import geopandas as gpd
 import pytest
-from shapely.geometry import MultiPolygon, Polygon
 
-from maps.cli import filter_exclaves, generate_map
+from maps.models import BOUNDS_COLUMNS
+
+if TYPE_CHECKING:
+    # Only needed for annotations; the fixtures create the geometries
+    import geopandas as gpd
+    from shapely.geometry import Polygon
+
+pytestmark = pytest.mark.cli
+
+
+@dataclass(frozen=True)
+class MapArgs:
+    """Stand-in for the argparse namespace consumed by generate_map."""
+
+    country: str = "Russia"
+    db_path: str = "natural_earth_vector.sqlite"
+    exclude_exclaves: bool = True
+    output: str = "/tmp/test_map.png"
+    dpi: int = 300
+    target_percentage: float = 0.3
+    show_labels: bool = True
+    label_size: float = 8.0
+    label_type: str = "name"
+    border_width: float = 0.5
+    show_territory_info: bool = False
 
 
+BASE_ARGS = MapArgs()
+
+
+@pytest.mark.geo
 class TestFilterExclaves:
-    """Test suite for the filter_exclaves function."""
+    """
+    Test suite for the filter_exclaves function.
 
-    def test_filter_with_multipolygon(self) -> None:
-        """Test filtering exclaves with a MultiPolygon geometry."""
-        # Create a mock target country with a MultiPolygon geometry
-        main_polygon = Polygon([(0, 0), (0, 10), (10, 10), (10, 0)])
-        small_polygon = Polygon([(20, 20), (20, 21), (21, 21), (21, 20)])
-        multi_polygon = MultiPolygon([main_polygon, small_polygon])
+    The filter relies on shapely 2's vectorized GEOS functions, so these tests are
+    marked geo and skipped on older stacks (see tests/conftest.py).
+    """
 
-        # Create mock GeoDataFrame
-        target_country = gpd.GeoDataFrame(
-            {"name": ["TestCountry"], "geometry": [multi_polygon]}
-        )
+    @pytest.mark.parametrize("main_percentage", [99.0, 85.5, 60.0])
+    def test_filter_with_multipolygon(
+        self,
+        main_percentage: float,
+        main_polygon: Polygon,
+        multi_poly_gdf: gpd.GeoDataFrame,
+    ) -> None:
+        """Test filtering exclaves with a MultiPolygon geometry."""
+        from maps.cli import filter_exclaves
 
         # Create mock territory info
         territory_info = {
             "territories": [
-                {"percentage": 99.0},  # Main polygon is 99% of total area
-                {"percentage": 1.0},  # Small polygon is 1% of total area
+                {"percentage": main_percentage},
+                {"percentage": 100.0 - main_percentage},
             ]
         }
 
         # Call the function
-        filtered_country, percentage = filter_exclaves(target_country, territory_info)
+        filtered_country, percentage = filter_exclaves(multi_poly_gdf, territory_info)
 
         # Verify the results
-        assert percentage == 99.0
-        assert isinstance(filtered_country, gpd.GeoDataFrame)
-        assert isinstance(filtered_country.geometry.iloc[0], Polygon)
+        assert percentage == main_percentage
+        assert isinstance(filtered_country, type(multi_poly_gdf))
+        assert filtered_country.geometry.iloc[0].geom_type == "Polygon"
         assert filtered_country.geometry.iloc[0].equals(main_polygon)
+        # The shared input frame is left untouched
+        assert multi_poly_gdf.geometry.iloc[0].geom_type == "MultiPolygon"
 
-    def test_filter_with_single_polygon(self) -> None:
-        """Test that a single Polygon is returned unchanged."""
-        # Create a mock target country with a single Polygon
-        polygon = Polygon([(0, 0), (0, 10), (10, 10), (10, 0)])
+    def test_filter_uses_territory_index(
+        self, small_polygon: Polygon, multi_poly_gdf: gpd.GeoDataFrame
+    ) -> None:
+        """Test that the part index from territory_info is used instead of areas."""
+        from maps.cli import filter_exclaves
+
+        # Claim the second part is the main territory; areas would say otherwise
+        territory_info = {
+            "territories": [
+                {"percentage": 70.0, "index": 1},
+                {"percentage": 30.0, "index": 0},
+            ]
+        }
+
+        with patch("maps.cli.shapely.area") as mock_area:
+            filtered_country, percentage = filter_exclaves(
+                multi_poly_gdf, territory_info
+            )
+
+        mock_area.assert_not_called()
+        assert percentage == 70.0
+        assert filtered_country.geometry.iloc[0].equals(small_polygon)
+
+    @pytest.mark.parametrize(
+        "territory_info",
+        [
+            {"territories": [{"percentage": 100.0}]},
+            {
+                "has_exclaves": False,
+                "is_island_nation": False,
+                "territories": [{"percentage": 99.0}, {"percentage": 1.0}],
+            },
+        ],
+        ids=["single_territory", "continuous"],
+    )
+    def test_filter_short_circuits(
+        self, multi_poly_gdf: gpd.GeoDataFrame, territory_info: dict
+    ) -> None:
+        """Test that nothing is filtered when territory_info says there is nothing to do."""
+        from maps.cli import filter_exclaves
 
-        # Create mock GeoDataFrame
-        target_country = gpd.GeoDataFrame(
-            {"name": ["TestCountry"], "geometry": [polygon]}
-        )
+        with patch("maps.cli.shapely.get_parts") as mock_get_parts:
+            filtered_country, percentage = filter_exclaves(
+                multi_poly_gdf, territory_info
+            )
+
+        mock_get_parts.assert_not_called()
+        assert filtered_country is multi_poly_gdf
+        assert percentage == territory_info["territories"][0]["percentage"]
+
+    def test_filter_updates_precomputed_bounds(
+        self, multi_poly_gdf: gpd.GeoDataFrame
+    ) -> None:
+        """Test that precomputed bounds columns follow the filtered geometry."""
+        from maps.cli import filter_exclaves
+
+        target_country = multi_poly_gdf.copy()
+        target_country[BOUNDS_COLUMNS] = [[0.0, 0.0, 21.0, 21.0]]
+        territory_info = {"territories": [{"percentage": 99.0}, {"percentage": 1.0}]}
+
+        filtered_country, _ = filter_exclaves(target_country, territory_info)
+
+        assert filtered_country[BOUNDS_COLUMNS].iloc[0].tolist() == [
+            0.0,
+            0.0,
+            10.0,
+            10.0,
+        ]
+        # The input frame is left untouched
+        assert target_country[BOUNDS_COLUMNS].iloc[0].tolist() == [
+            0.0,
+            0.0,
+            21.0,
+            21.0,
+        ]
+
+    def test_filter_keeps_polygon_with_exclave_info(
+        self, single_poly_gdf: gpd.GeoDataFrame
+    ) -> None:
+        """Test that a single Polygon is kept even if territory_info reports exclaves."""
+        from maps.cli import filter_exclaves
+
+        territory_info = {
+            "has_exclaves": True,
+            "territories": [{"percentage": 90.0}, {"percentage": 10.0}],
+        }
+
+        filtered_country, percentage = filter_exclaves(single_poly_gdf, territory_info)
+
+        assert filtered_country is single_poly_gdf
+        assert percentage == 90.0
+
+    def test_filter_with_single_polygon(
+        self, main_polygon: Polygon, single_poly_gdf: gpd.GeoDataFrame
+    ) -> None:
+        """Test that a single Polygon is returned unchanged."""
+        from maps.cli import filter_exclaves
 
         # Create mock territory info (not actually used in this case)
         territory_info = {
@@ -59,151 +182,88 @@ class TestFilterExclaves:
         }
 
         # Call the function
-        filtered_country, percentage = filter_exclaves(target_country, territory_info)
+        filtered_country, percentage = filter_exclaves(single_poly_gdf, territory_info)
 
         # Verify the results - should return the original target_country and None percentage
         assert (
             percentage == 100.0
         )  # When there's a single polygon, percentage is still returned
-        assert filtered_country is target_country
-        assert filtered_country.geometry.iloc[0].equals(polygon)
+        assert filtered_country is single_poly_gdf
+        assert filtered_country.geometry.iloc[0].equals(main_polygon)
 
 
 class TestGenerateMap:
     """Test suite for the generate_map function."""
 
-    @patch("maps.cli.filter_exclaves")
-    @patch("maps.cli.get_country_territory_info")
-    @patch("maps.cli.load_country_data")
-    @patch("maps.cli.create_map")
-    def test_filter_exclaves_called_when_flag_set(
+    @pytest.mark.parametrize(
+        "exclude_flag,argv",
+        [
+            (True, ["maps/cli.py", "Russia", "--exclude-exclaves", "true"]),
+            (False, ["maps/cli.py", "Russia"]),
+        ],
+        ids=["flag_set", "flag_not_set"],
+    )
+    def test_filter_exclaves_follows_flag(
         self,
-        mock_create_map: MagicMock,
-        mock_load_country_data: MagicMock,
-        mock_get_territory_info: MagicMock,
-        mock_filter_exclaves: MagicMock,
+        exclude_flag: bool,
+        argv: list[str],
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
-        """Test that filter_exclaves is called when the exclude_exclaves flag is set."""
-        # Mock command line arguments with exclude_exclaves flag set to true
-        monkeypatch.setattr(
-            "sys.argv", ["maps/cli.py", "Russia", "--exclude-exclaves", "true"]
-        )
-
-        # Create mock data
-        mock_countries = MagicMock()
-        mock_target_country = MagicMock()
-        mock_neighbor_names = ["Finland", "Norway"]
-
-        # Setup mock territory info to trigger the exclave handling
-        mock_territory_info = {
-            "has_exclaves": True,
-            "is_island_nation": False,
-            "territories": [{"percentage": 95.0}],
-            "territory_type": "has_exclave",
-        }
-
-        # Setup mock filter_exclaves to return modified data
-        filtered_country = MagicMock()
-        mock_filter_exclaves.return_value = (filtered_country, 95.0)
-
-        # Setup return values for mocks
-        mock_load_country_data.return_value = (
-            mock_countries,
-            mock_target_country,
-            mock_neighbor_names,
-        )
-        mock_get_territory_info.return_value = mock_territory_info
-
-        # Create a mock args object
-        class MockArgs:
-            country = "Russia"
-            db_path = "natural_earth_vector.sqlite"
-            exclude_exclaves = True
-            output = "/tmp/test_map.png"
-            dpi = 300
-            target_percentage = 0.3
-            show_labels = True
-            label_size = 8.0
-            label_type = "name"
-            border_width = 0.5
-            show_territory_info = False
-
-        # Call generate_map with mock args
-        generate_map(MockArgs())
-
-        # Verify filter_exclaves was called with correct arguments
-        mock_filter_exclaves.assert_called_once_with(
-            mock_target_country, mock_territory_info
-        )
-
-        # Verify create_map was called with the filtered country
-        mock_create_map.assert_called_once()
-        args, kwargs = mock_create_map.call_args
-        assert args[0] == mock_countries
-        assert (
-            args[1] == filtered_country
-        )  # Should be the filtered country, not the original
-
-    @patch("maps.cli.filter_exclaves")
-    @patch("maps.cli.get_country_territory_info")
-    @patch("maps.cli.load_country_data")
-    @patch("maps.cli.create_map")
-    def test_filter_exclaves_not_called_when_flag_not_set(
-        self,
-        mock_create_map: MagicMock,
-        mock_load_country_data: MagicMock,
-        mock_get_territory_info: MagicMock,
-        mock_filter_exclaves: MagicMock,
-        monkeypatch: pytest.MonkeyPatch,
-    ) -> None:
-        """Test that filter_exclaves is not called when the exclude_exclaves flag is not set."""
-        # Mock command line arguments without exclude_exclaves flag
-        monkeypatch.setattr("sys.argv", ["maps/cli.py", "Russia"])
-
-        # Create mock data
-        mock_countries = MagicMock()
-        mock_target_country = MagicMock()
-        mock_neighbor_names = ["Finland", "Norway"]
-
-        # Setup mock territory info
-        mock_territory_info = {
-            "has_exclaves": True,
-            "is_island_nation": False,
-            "territories": [{"percentage": 95.0}],
-            "territory_type": "has_exclave",
-        }
-
-        # Setup return values for mocks
-        mock_load_country_data.return_value = (
-            mock_countries,
-            mock_target_country,
-            mock_neighbor_names,
-        )
-        mock_get_territory_info.return_value = mock_territory_info
-
-        # Create a mock args object
-        class MockArgs:
-            country = "Russia"
-            db_path = "natural_earth_vector.sqlite"
-            exclude_exclaves = False  # Flag not set
-            output = "/tmp/test_map.png"
-            dpi = 300
-            target_percentage = 0.3
-            show_labels = True
-            label_size = 8.0
-            label_type = "name"
-            border_width = 0.5
-            show_territory_info = False
-
-        # Call generate_map with mock args
-        generate_map(MockArgs())
-
-        # Verify filter_exclaves was not called
-        mock_filter_exclaves.assert_not_called()
-
-        # Verify create_map was called with the original country
-        mock_create_map.assert_called_once()
-        args, kwargs = mock_create_map.call_args
-        assert args[0] == mock_countries
-        assert args[1] == mock_target_country  # Should be the original country
+        """Test that filter_exclaves is called only when the exclude_exclaves flag is set."""
+        from maps.cli import generate_map
+
+        with patch.multiple(
+            "maps.cli",
+            filter_exclaves=DEFAULT,
+            get_country_territory_info=DEFAULT,
+            load_country_data=DEFAULT,
+            create_map=DEFAULT,
+        ) as mocks:
+            mock_filter_exclaves = mocks["filter_exclaves"]
+            mock_get_territory_info = mocks["get_country_territory_info"]
+            mock_load_country_data = mocks["load_country_data"]
+            mock_create_map = mocks["create_map"]
+
+            # Mock command line arguments
+            monkeypatch.setattr("sys.argv", argv)
+
+            # Create mock data
+            mock_countries = sentinel.countries
+            mock_target_country = sentinel.target_country
+            mock_neighbor_names = ["Finland", "Norway"]
+
+            # Setup mock territory info to trigger the exclave handling
+            mock_territory_info = {
+                "has_exclaves": True,
+                "is_island_nation": False,
+                "territories": [{"percentage": 95.0}],
+                "territory_type": "has_exclave",
+            }
+
+            # Setup mock filter_exclaves to return modified data
+            filtered_country = sentinel.filtered_country
+            mock_filter_exclaves.return_value = (filtered_country, 95.0)
+
+            # Setup return values for mocks
+            mock_load_country_data.return_value = (
+                mock_countries,
+                mock_target_country,
+                mock_neighbor_names,
+            )
+            mock_get_territory_info.return_value = mock_territory_info
+
+            # Call generate_map with args matching the command line
+            generate_map(replace(BASE_ARGS, exclude_exclaves=exclude_flag))
+
+            # Verify create_map was called with the filtered country only when filtering
+            mock_create_map.assert_called_once()
+            args, kwargs = mock_create_map.call_args
+            assert args[0] is mock_countries
+            if exclude_flag:
+                mock_filter_exclaves.assert_called_once_with(
+                    mock_target_country, mock_territory_info
+                )
+                assert args[1] is filtered_country
+            else:
+                mock_filter_exclaves.assert_not_called()
+                assert args[1] is mock_target_country
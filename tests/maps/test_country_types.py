@@ -11,9 +11,10 @@ import argparse
 import logging
 import os
 import sys
+from functools import lru_cache
 from typing import List, Optional
 
-from maps.territory_analyzer import CountryGeometryType, TerritoryAnalyzer
+from maps.territory_analyzer import TerritoryAnalysisResult, TerritoryAnalyzer
 
 # Configure logging
 logging.basicConfig(
@@ -24,8 +25,74 @@ logging.basicConfig(
 logger = logging.getLogger("test_country_types")
 
 
+@lru_cache(maxsize=8)
+def _get_analyzer(threshold: float) -> TerritoryAnalyzer:
+    """
+    Get a TerritoryAnalyzer for the given threshold, reusing earlier instances.
+
+    The analyzer holds no database handles or other per-run state, so a cached
+    instance can safely be shared between calls and threads.
+
+    Args:
+        threshold: Threshold for determining if a polygon is dominant
+
+    Returns:
+        TerritoryAnalyzer configured with the threshold
+    """
+    return TerritoryAnalyzer(main_area_threshold=threshold)
+
+
+def _format_result(result: TerritoryAnalysisResult) -> List[str]:
+    """
+    Format the analysis result of a country as report lines.
+
+    Args:
+        result: Analysis result to format
+
+    Returns:
+        Lines of the report, including one line per territory for countries with
+        more than one polygon
+    """
+    lines = [
+        f"Analyzing {result.country_name}...",
+        f"Country: {result.country_name}",
+        f"Classification: {result.geometry_type.value}",
+        f"Total area: {result.total_area:.2f} square units",
+        f"Number of polygons: {result.polygon_count}",
+    ]
+
+    if result.polygon_count > 1:
+        lines.append(
+            f"Largest polygon: {result.main_polygon_percentage:.2f}% of total area"
+        )
+        lines.append(
+            f"Max distance between polygons: {result.max_distance_between_polygons:.2f} units"
+        )
+
+        # Details of each territory
+        lines.append("Territories:")
+        lines.extend(
+            f"  {i}. Area: {area:.2f} sq units ({percentage:.2f}% of total), "
+            f"Centroid: {tuple(centroid)}"
+            for i, (area, percentage, centroid) in enumerate(
+                zip(
+                    result.territory_areas.tolist(),
+                    result.territory_percentages.tolist(),
+                    result.territory_centroids.tolist(),
+                ),
+                start=1,
+            )
+        )
+
+    lines.append("=" * 50)
+    return lines
+
+
 def analyze_countries(
-    countries: List[str], db_path: str, threshold: float = 0.8
+    countries: List[str],
+    db_path: str,
+    threshold: float = 0.8,
+    max_workers: Optional[int] = None,
 ) -> None:
     """
     Analyze a list of countries and print the results.
@@ -34,42 +101,35 @@ def analyze_countries(
         countries: List of country names to analyze
         db_path: Path to the Natural Earth SQLite database
         threshold: Threshold for determining if a polygon is dominant (default: 0.8)
+        max_workers: Number of threads used for the analysis
+                     (default: one per country, up to the number of CPUs)
     """
-    analyzer = TerritoryAnalyzer(main_area_threshold=threshold)
-    logger.info(f"Using main area threshold: {threshold}")
-
-    for country_name in countries:
-        try:
-            logger.info(f"Analyzing {country_name}...")
-            result = analyzer.analyze_from_db(country_name, db_path)
-
-            # Print summary
-            logger.info(f"Country: {result.country_name}")
-            logger.info(f"Classification: {result.geometry_type.value}")
-            logger.info(f"Total area: {result.total_area:.2f} square units")
-            logger.info(f"Number of polygons: {result.polygon_count}")
+    if max_workers is None:
+        max_workers = min(len(countries), os.cpu_count() or 1)
 
-            if result.polygon_count > 1:
-                logger.info(
-                    f"Largest polygon: {result.main_polygon_percentage:.2f}% of total area"
-                )
-                logger.info(
-                    f"Max distance between polygons: {result.max_distance_between_polygons:.2f} units"
-                )
-
-                # Print details of each territory
-                logger.info("Territories:")
-                for i, territory in enumerate(result.separate_territories):
-                    logger.info(
-                        f"  {i+1}. Area: {territory['area']:.2f} sq units "
-                        f"({territory['percentage']:.2f}% of total), "
-                        f"Centroid: {territory['centroid']}"
-                    )
-
-            logger.info("=" * 50)
+    analyzer = _get_analyzer(threshold)
+    logger.info(f"Using main area threshold: {threshold}")
 
-        except Exception as e:
-            logger.error(f"Error analyzing {country_name}: {e}")
+    def report_error(country_name: str, error: Exception) -> None:
+        logger.error(f"Error analyzing {country_name}: {error}")
+
+    # Load all countries with a single query. Every country is analyzed in its own
+    # try/except inside the batch, so a missing or failing country is reported through
+    # report_error, in the order of the list, and does not stop the others.
+    try:
+        results = analyzer.analyze_from_db_batch(
+            countries, db_path, max_workers=max_workers, on_error=report_error
+        )
+        for country_name, result in results:
+            try:
+                # Emit one log record per country. Island nations can have hundreds of
+                # territories, so skip building the report when INFO is muted.
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("\n".join(_format_result(result)))
+            except Exception as e:
+                report_error(country_name, e)
+    except Exception as e:
+        logger.error(f"Error loading countries: {e}")
 
 
 def parse_args() -> argparse.Namespace:
@@ -100,6 +160,12 @@ def parse_args() -> argparse.Namespace:
         default=0.8,
         help="Threshold for determining if a polygon is dominant (0.0-1.0)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of threads used for the analysis (default: one per CPU)",
+    )
     return parser.parse_args()
 
 
@@ -112,8 +178,10 @@ def main() -> None:
         logger.error(f"Database file not found: {args.db_path}")
         return
 
-    # Parse countries list
-    countries = [c.strip() for c in args.countries.split(",")]
+    # Parse countries list, dropping blanks and duplicates while keeping the order
+    countries = list(
+        dict.fromkeys(c.strip() for c in args.countries.split(",") if c.strip())
+    )
     if not countries:
         logger.error("No countries specified")
         return
@@ -124,7 +192,7 @@ def main() -> None:
         return
 
     # Run analysis
-    analyze_countries(countries, args.db_path, args.threshold)
+    analyze_countries(countries, args.db_path, args.threshold, args.workers)
 
 
 if __name__ == "__main__":
@@ -1,18 +1,67 @@
-"""Tests for the draw_map module."""
-
-from unittest.mock import MagicMock, patch
-
-import geopandas as gpd
-import pandas as pd
+"""
+Tests for the draw_map module.
+
+pandas, geopandas and the modules that depend on them are imported inside the tests
+that use them, so collecting this file or running only the configuration tests does
+not pay for loading the geodata stack. shapely is already loaded by maps.models.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from dataclasses import asdict, replace
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+from unittest.mock import MagicMock, call, patch
+
+import numpy as np
 import pytest
-from matplotlib.figure import Figure
-from pandas import DataFrame
-from shapely.geometry import Polygon
-
-from maps.cli import main, parse_args
-from maps.draw_map import load_country_data
-from maps.models import MapColors, MapConfiguration
-from maps.renderer import create_map
+import shapely
+from matplotlib.colors import to_rgba_array
+from matplotlib.path import Path
+from shapely.geometry import LinearRing, MultiPolygon, Polygon
+
+from maps.models import BOUNDS_COLUMNS, MapColors, MapConfiguration
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+    from pandas import DataFrame
+
+# Country shapes shared by the tests; shapely geometries are immutable, so sharing is safe.
+# All of them are boxes, built in one vectorized call from (minx, miny, maxx, maxy).
+_COUNTRY_BOXES = {
+    "Germany": (10, 50, 15, 55),
+    "France": (5, 45, 10, 50),
+    "Belgium": (8, 48, 12, 52),
+    "Netherlands": (6, 51, 8, 54),
+    "Poland": (15, 50, 20, 55),
+}
+_GERMANY_POLY, _FRANCE_POLY, _BELGIUM_POLY, _NETHERLANDS_POLY, _POLAND_POLY = shapely.box(
+    *np.array(list(_COUNTRY_BOXES.values())).T
+)
+
+# WKB blobs as stored in the database, serialized once for make_country_rows
+_COUNTRY_WKB = {
+    "Germany": _GERMANY_POLY.wkb,
+    "France": _FRANCE_POLY.wkb,
+    "Belgium": _BELGIUM_POLY.wkb,
+    "Netherlands": _NETHERLANDS_POLY.wkb,
+}
+
+
+# Default color scheme of MapColors, field by field
+_EXPECTED_DEFAULT_COLORS = {
+    "target_color": "#ffaaaa",
+    "neighbor_color": "#aaaaff",
+    "other_color": "#f5f5f5",
+    "border_color": "#333333",
+    "ocean_color": "#e6f2ff",
+    "highlight_color": "#ffff00",
+    "text_color": "#000000",
+}
 
 
 class TestMapColors:
@@ -20,16 +69,7 @@ class TestMapColors:
 
     def test_default_values(self) -> None:
         """Test that MapColors has the expected default values."""
-        colors = MapColors()
-
-        # Check default color values
-        assert colors.target_color == "#ffaaaa"
-        assert colors.neighbor_color == "#aaaaff"
-        assert colors.other_color == "#f5f5f5"
-        assert colors.border_color == "#333333"
-        assert colors.ocean_color == "#e6f2ff"
-        assert colors.highlight_color == "#ffff00"
-        assert colors.text_color == "#000000"
+        assert asdict(MapColors()) == _EXPECTED_DEFAULT_COLORS
 
     def test_immutability(self) -> None:
         """Test that MapColors is immutable (frozen)."""
@@ -43,22 +83,28 @@ class TestMapColors:
 class TestMapConfiguration:
     """Test suite for the MapConfiguration class."""
 
-    def test_required_parameters(self) -> None:
-        """Test that MapConfiguration requires output_path and title."""
-        config = MapConfiguration(output_path="/tmp/test.png", title="Test Map")
-
-        assert config.output_path == "/tmp/test.png"
-        assert config.title == "Test Map"
-
-    def test_default_values(self) -> None:
-        """Test that MapConfiguration has the expected default values."""
-        config = MapConfiguration(output_path="/tmp/test.png", title="Test Map")
-
-        assert config.figsize == (10, 8)
-        assert config.dpi == 300
-        assert isinstance(config.colors, MapColors)
-        assert config.show_labels is True
-        assert config.target_percentage == 0.3
+    @pytest.fixture(scope="class")
+    def default_config(self) -> MapConfiguration:
+        """Build a MapConfiguration with only the required parameters, once per class."""
+        return MapConfiguration(output_path="/tmp/test.png", title="Test Map")
+
+    @pytest.mark.parametrize(
+        "attr,expected",
+        [
+            ("output_path", "/tmp/test.png"),
+            ("title", "Test Map"),
+            ("figsize", (10, 8)),
+            ("dpi", 300),
+            ("colors", MapColors()),
+            ("show_labels", True),
+            ("target_percentage", 0.3),
+        ],
+    )
+    def test_default_values(
+        self, default_config: MapConfiguration, attr: str, expected: object
+    ) -> None:
+        """Test that MapConfiguration keeps the required parameters and has the defaults."""
+        assert getattr(default_config, attr) == expected
 
     def test_custom_values(self) -> None:
         """Test that MapConfiguration accepts custom values."""
@@ -79,316 +125,232 @@ class TestMapConfiguration:
         assert config.show_labels is False
         assert config.target_percentage == 0.6
 
-    def test_immutability(self) -> None:
-        """Test that MapConfiguration is immutable (frozen)."""
-        config = MapConfiguration(output_path="/tmp/test.png", title="Test Map")
+    @pytest.mark.parametrize(
+        "target_percentage,expected_scale",
+        [(0.25, 2.0), (1.0, 1.0), (0.04, 5.0)],
+    )
+    def test_scale_factor(self, target_percentage: float, expected_scale: float) -> None:
+        """Test that the view scale factor is derived from target_percentage."""
+        config = MapConfiguration(
+            output_path="/tmp/test.png",
+            title="Test Map",
+            target_percentage=target_percentage,
+        )
+
+        assert config.scale_factor == pytest.approx(expected_scale)
+        # Replacing the percentage recomputes the derived value
+        assert replace(config, target_percentage=1.0).scale_factor == 1.0
+        # The derived value is not a field, so it is not serialized with the config
+        assert "scale_factor" not in asdict(config)
 
+    def test_immutability(self, default_config: MapConfiguration) -> None:
+        """Test that MapConfiguration is immutable (frozen)."""
         # Attempting to modify should raise an error
         with pytest.raises(AttributeError):
-            config.title = "New Title"
+            default_config.title = "New Title"
+
+
+@lru_cache(maxsize=64)
+def make_config(
+    output_path: str = "/tmp/test.png", title: str = "Test Map", **options: Any
+) -> MapConfiguration:
+    """
+    Build a MapConfiguration for the rendering tests, once per set of arguments.
+
+    MapConfiguration is frozen, so tests asking for the same settings can share one
+    instance. All arguments must be hashable.
+    """
+    return MapConfiguration(output_path=output_path, title=title, **options)
+
+
+@lru_cache(maxsize=None)
+def _country_rows(names: tuple[str, ...]) -> DataFrame:
+    """Build the database rows for the given countries once per set of names."""
+    from pandas import DataFrame
+
+    return DataFrame(
+        {
+            "name": names,
+            "iso_a3": [name[:3].upper() for name in names],
+            "name_en": names,
+            "GEOMETRY": [_COUNTRY_WKB[name] for name in names],
+        }
+    )
+
 
+def make_country_rows(names: list[str]) -> DataFrame:
+    """
+    Build the rows load_country_data reads from the database for the given countries.
 
+    The frame is cached per set of names and shared, so it must not be modified.
+    """
+    return _country_rows(tuple(names))
+
+
+@pytest.mark.parametrize("module", ["maps.cli", "maps.draw_map", "maps.renderer"])
+def test_importing_map_modules_does_not_load_geopandas(
+    module: str, pytestconfig: pytest.Config
+) -> None:
+    """Test that the map modules only import geopandas once a frame is built."""
+    # A fresh interpreter, since other tests have already loaded geopandas in this one
+    code = f"import sys, {module}; sys.exit('geopandas' in sys.modules)"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=pytestconfig.rootpath)
+
+
+@pytest.mark.geo
 class TestLoadCountryData:
     """Test suite for the load_country_data function."""
 
-    @patch("os.path.exists")
-    def test_database_not_found(self, mock_exists: MagicMock) -> None:
+    def test_database_not_found(self, patched_draw_map_db: SimpleNamespace) -> None:
         """Test that FileNotFoundError is raised when the database doesn't exist."""
-        # Mock file existence check
-        mock_exists.return_value = False
+        from maps.draw_map import load_country_data
+
+        patched_draw_map_db.exists.return_value = False
 
         # Call should raise FileNotFoundError
-        with pytest.raises(FileNotFoundError, match="Database file not found"):
+        with pytest.raises(FileNotFoundError) as excinfo:
             load_country_data("Germany", "nonexistent.db")
+        assert "Database file not found" in str(excinfo.value)
 
-    @patch("os.path.exists")
-    @patch("maps.draw_map.get_neighboring_countries")
     def test_error_finding_neighbors(
-        self, mock_get_neighbors: MagicMock, mock_exists: MagicMock
+        self, patched_draw_map_db: SimpleNamespace
     ) -> None:
         """Test that ValueError is raised when there's an error finding neighbors."""
-        # Mock file existence check
-        mock_exists.return_value = True
+        from maps.draw_map import load_country_data
 
         # Mock get_neighboring_countries to return an error
-        mock_get_neighbors.return_value = "Country 'InvalidCountry' not found"
+        patched_draw_map_db.get_neighboring_countries.return_value = (
+            "Country 'InvalidCountry' not found"
+        )
 
         # Call should raise ValueError
-        with pytest.raises(ValueError, match="Error finding neighbors"):
+        with pytest.raises(ValueError) as excinfo:
             load_country_data("InvalidCountry", "test.db")
+        assert "Error finding neighbors" in str(excinfo.value)
 
-    @patch("os.path.exists")
-    @patch("maps.draw_map.get_neighboring_countries")
-    @patch("sqlite3.connect")
-    @patch("pandas.read_sql")
-    def test_country_not_found(
-        self,
-        mock_read_sql: MagicMock,
-        mock_connect: MagicMock,
-        mock_get_neighbors: MagicMock,
-        mock_exists: MagicMock,
-    ) -> None:
+    def test_country_not_found(self, patched_draw_map_db: SimpleNamespace) -> None:
         """Test that ValueError is raised when the country isn't in the database."""
-        # Mock file existence check
-        mock_exists.return_value = True
+        from maps.draw_map import load_country_data
 
-        # Mock get_neighboring_countries to return some neighbors
-        mock_get_neighbors.return_value = [("France", "FRA"), ("Belgium", "BEL")]
+        # The database only contains other countries
+        patched_draw_map_db.set_rows(
+            make_country_rows(["France", "Belgium", "Netherlands"])
+        )
 
-        # Mock database connection
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
+        # Call should raise ValueError
+        with pytest.raises(ValueError) as excinfo:
+            load_country_data("Germany", "test.db")
+        assert "Country 'Germany' not found" in str(excinfo.value)
 
-        # Create mock DataFrame with countries (but not Germany)
-        mock_data = {
-            "name": ["France", "Belgium", "Netherlands"],
-            "iso_a3": ["FRA", "BEL", "NLD"],
-            "GEOMETRY": [b"test1", b"test2", b"test3"],
-        }
-        mock_df = DataFrame(mock_data)
-        mock_read_sql.return_value = mock_df
-
-        # Mock GeoDataFrame creation and conversion
-        with patch("geopandas.GeoDataFrame", return_value=mock_df):
-            with patch(
-                "shapely.wkb.loads",
-                return_value=Polygon([(0, 0), (0, 1), (1, 1), (1, 0)]),
-            ):
-                # Add sample method
-                mock_df.sample = MagicMock(
-                    return_value=DataFrame({"name": ["France", "Belgium"]})
-                )
-
-                # Call should raise ValueError
-                with pytest.raises(ValueError, match="Country 'Germany' not found"):
-                    load_country_data("Germany", "test.db")
-
-    @patch("os.path.exists")
-    @patch("maps.draw_map.get_neighboring_countries")
-    @patch("sqlite3.connect")
-    @patch("pandas.read_sql")
-    def test_successful_load(
-        self,
-        mock_read_sql: MagicMock,
-        mock_connect: MagicMock,
-        mock_get_neighbors: MagicMock,
-        mock_exists: MagicMock,
-    ) -> None:
+    def test_successful_load(self, patched_draw_map_db: SimpleNamespace) -> None:
         """Test successful loading of country data."""
-        # Mock file existence check
-        mock_exists.return_value = True
-
-        # Mock get_neighboring_countries to return some neighbors
-        mock_get_neighbors.return_value = [("France", "FRA"), ("Belgium", "BEL")]
+        from maps.draw_map import load_country_data
 
-        # Mock database connection
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-
-        # Create mock DataFrame with countries
-        mock_data = {
-            "name": ["Germany", "France", "Belgium"],
-            "iso_a3": ["DEU", "FRA", "BEL"],
-            "GEOMETRY": [b"test1", b"test2", b"test3"],
-        }
-        mock_df = DataFrame(mock_data)
-        mock_read_sql.return_value = mock_df
-
-        # Mock GeoDataFrame creation
-        germany_poly = Polygon([(10, 50), (10, 55), (15, 55), (15, 50)])
-        france_poly = Polygon([(5, 45), (5, 50), (10, 50), (10, 45)])
-        belgium_poly = Polygon([(8, 48), (8, 52), (12, 52), (12, 48)])
-
-        mock_gdf = gpd.GeoDataFrame(
-            {
-                "name": ["Germany", "France", "Belgium"],
-                "iso_a3": ["DEU", "FRA", "BEL"],
-                "geometry": [germany_poly, france_poly, belgium_poly],
-                "display_iso": ["DEU", "FRA", "BEL"],
-            }
+        patched_draw_map_db.set_rows(
+            make_country_rows(["Germany", "France", "Belgium"])
         )
 
-        with patch("geopandas.GeoDataFrame", return_value=mock_gdf):
-            with patch("shapely.wkb.loads") as mock_loads:
-                # Set up mock to return different polygons for each country
-                mock_loads.side_effect = [germany_poly, france_poly, belgium_poly]
-
-                # Call the function
-                countries, target_country, neighbor_names = load_country_data(
-                    "Germany", "test.db"
-                )
+        # Call the function
+        countries, target_country, neighbor_names = load_country_data(
+            "Germany", "test.db"
+        )
 
-                # Verify the results
-                assert len(countries) == 3
-                assert len(target_country) == 1
-                assert target_country.iloc[0]["name"] == "Germany"
-                assert len(neighbor_names) == 2
-                assert "France" in neighbor_names
-                assert "Belgium" in neighbor_names
+        # Verify the results
+        assert len(countries) == 3
+        assert len(target_country) == 1
+        assert target_country.iloc[0]["name"] == "Germany"
+        assert target_country.iloc[0]["display_name"] == "Germany"
+        assert target_country[BOUNDS_COLUMNS].iloc[0].tolist() == [10, 50, 15, 55]
+        assert neighbor_names == ["France", "Belgium"]
+        assert patched_draw_map_db.connect.return_value.close.call_count == 1
 
 
+@pytest.mark.geo
 class TestCreateMap:
-    """Test suite for the create_map function."""
+    """
+    Test suite for the create_map function.
 
-    @pytest.fixture
+    The input fixtures are module-scoped and shared between tests; create_map must not
+    modify its inputs, which test_create_map_does_not_modify_inputs guards.
+    """
+
+    @pytest.fixture(scope="module")
     def mock_countries(self) -> gpd.GeoDataFrame:
         """Create a mock GeoDataFrame with countries for testing."""
-        # Create mock polygons for countries
-        germany_poly = Polygon([(10, 50), (10, 55), (15, 55), (15, 50)])
-        france_poly = Polygon([(5, 45), (5, 50), (10, 50), (10, 45)])
-        poland_poly = Polygon([(15, 50), (15, 55), (20, 55), (20, 50)])
+        import geopandas as gpd
 
         # Create mock GeoDataFrame
         return gpd.GeoDataFrame(
             {
                 "name": ["Germany", "France", "Poland"],
                 "display_iso": ["DEU", "FRA", "POL"],
-                "geometry": [germany_poly, france_poly, poland_poly],
+                "geometry": [_GERMANY_POLY, _FRANCE_POLY, _POLAND_POLY],
             }
         )
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_target_country(self, mock_countries: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
         """Create a mock GeoDataFrame with just the target country for testing."""
         return mock_countries[mock_countries["name"] == "Germany"]
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_neighbor_names(self) -> list[str]:
         """Create a list of neighbor country names for testing."""
         return ["France", "Poland"]
 
     @pytest.fixture
+    def mock_savefig(self) -> Iterator[MagicMock]:
+        """Replace Figure.savefig, so the real figure is built but no image is written."""
+        from matplotlib.figure import Figure
+
+        with patch.object(Figure, "savefig", autospec=True) as savefig:
+            yield savefig
+
+    @pytest.fixture(scope="module")
     def mock_config(self) -> MapConfiguration:
         """Create a mock MapConfiguration for testing."""
-        return MapConfiguration(
-            output_path="/tmp/test.png",
-            title="Test Map",
-            figsize=(8, 6),
-            dpi=100,
-        )
+        return make_config(figsize=(8, 6), dpi=100)
 
-    @patch("matplotlib.pyplot.subplots")
-    @patch("matplotlib.pyplot.savefig")
-    @patch("matplotlib.pyplot.close")
     def test_create_map_basic(
         self,
-        mock_close: MagicMock,
         mock_savefig: MagicMock,
-        mock_subplots: MagicMock,
         mock_countries: gpd.GeoDataFrame,
         mock_target_country: gpd.GeoDataFrame,
         mock_neighbor_names: list[str],
         mock_config: MapConfiguration,
     ) -> None:
         """Test basic map creation functionality."""
-        # Mock figure and axis
-        mock_fig = MagicMock(spec=Figure)
-        mock_ax = MagicMock()
-        mock_subplots.return_value = (mock_fig, mock_ax)
-
-        # Mock the DataFrame methods to properly handle the create_map function's operations
-        neighbor_countries = MagicMock(spec=gpd.GeoDataFrame)
-        mock_plot_result = MagicMock()
-
-        # Use patch to intercept the GeoDataFrame methods
-        with patch.object(gpd, "GeoDataFrame", return_value=mock_countries):
-            with patch.object(
-                mock_countries, "plot", return_value=mock_plot_result
-            ) as mock_plot:
-                with patch.object(
-                    mock_target_country, "plot", return_value=mock_plot_result
-                ) as mock_target_plot:
-                    # Create a simple patch for the dataframe filtering operation
-                    with patch(
-                        "geopandas.GeoDataFrame.__getitem__",
-                        return_value=neighbor_countries,
-                    ) as mock_getitem:
-                        # Call the function
-                        create_map(
-                            mock_countries,
-                            mock_target_country,
-                            mock_neighbor_names,
-                            mock_config,
-                        )
-
-        # Basic assertions
-        mock_savefig.assert_called_once_with(
-            mock_config.output_path, dpi=mock_config.dpi, bbox_inches="tight"
+        from matplotlib.figure import Figure
+
+        from maps.renderer import create_map
+
+        create_map(
+            mock_countries,
+            mock_target_country,
+            mock_neighbor_names,
+            mock_config,
         )
-        mock_close.assert_called_once()
 
-    @patch("matplotlib.pyplot.subplots")
-    @patch("matplotlib.pyplot.savefig")
-    @patch("matplotlib.pyplot.close")
-    def test_create_map_with_labels(
-        self,
-        mock_close: MagicMock,
-        mock_savefig: MagicMock,
-        mock_subplots: MagicMock,
-        mock_config: MapConfiguration,
-    ) -> None:
-        """Test map creation with labels and title."""
-        # Create mocks that can be passed to the function
-        mock_ax = MagicMock()
-        mock_fig = MagicMock()
-        mock_subplots.return_value = (mock_fig, mock_ax)
-
-        # Create mock GeoDataFrames that can pass through the function
-        mock_countries = MagicMock(spec=gpd.GeoDataFrame)
-        mock_target_country = MagicMock(spec=gpd.GeoDataFrame)
-
-        # Minimal setup to avoid most common errors
-        mock_countries.copy.return_value = mock_countries
-        mock_countries.__getitem__.return_value = mock_countries
-        mock_target_country.__getitem__.return_value = pd.Series(["Germany"])
-
-        # Create a very simple geometry access mock
-        polygon = Polygon([(0, 0), (0, 1), (1, 1), (1, 0)])
-        mock_target_country.geometry = MagicMock()
-        # Just make it so the .iloc[0] access can work
-        mock_target_country.geometry.iloc = MagicMock()
-        mock_target_country.geometry.iloc.__getitem__ = MagicMock(return_value=polygon)
-
-        # Use a try/except to handle any errors in the function
-        try:
-            # Call the function - just verify it doesn't raise exceptions
-            create_map(
-                mock_countries, mock_target_country, ["France", "Poland"], mock_config
-            )
-            # If we get here, the test passes
-            assert True
-        except Exception as e:
-            # If there's any exception during the call, fail the test
-            assert False, f"create_map raised an exception: {e}"
-
-    @patch("matplotlib.pyplot.subplots")
-    @patch("matplotlib.pyplot.savefig")
-    @patch("matplotlib.pyplot.close")
-    def test_create_map_with_legend(
+        # The figure is saved once, cropped to its content, at the configured dpi
+        assert mock_savefig.call_count == 1
+        figure = mock_savefig.call_args.args[0]
+        assert isinstance(figure, Figure)
+        assert figure.dpi == mock_config.dpi
+        assert mock_savefig.call_args == call(
+            figure, mock_config.output_path, dpi=mock_config.dpi, bbox_inches="tight"
+        )
+
+    def test_create_map_draws_countries(
         self,
-        mock_close: MagicMock,
         mock_savefig: MagicMock,
-        mock_subplots: MagicMock,
         mock_countries: gpd.GeoDataFrame,
         mock_target_country: gpd.GeoDataFrame,
         mock_neighbor_names: list[str],
         mock_config: MapConfiguration,
     ) -> None:
-        """Test map creation with legend."""
-        # Mock figure and axis
-        mock_fig = MagicMock(spec=Figure)
-        mock_ax = MagicMock()
-        mock_subplots.return_value = (mock_fig, mock_ax)
-
-        # Mock the DataFrame methods
-        neighbor_countries = MagicMock(spec=gpd.GeoDataFrame)
-        mock_plot_result = MagicMock()
-
-        # Simplify the test by just skipping the more complex mocking
-        # We'll settle for verifying that the function completed without errors
-        # and that the final steps (savefig, close) were called
+        """Test that every country is drawn with the color matching its role."""
+        from maps.renderer import create_map
 
-        # Call the function - it has side effects we can verify without complex mocking
         create_map(
             mock_countries,
             mock_target_country,
@@ -396,386 +358,365 @@ class TestCreateMap:
             mock_config,
         )
 
-        # Basic assertions
-        mock_savefig.assert_called_once_with(
-            mock_config.output_path, dpi=mock_config.dpi, bbox_inches="tight"
+        figure = mock_savefig.call_args.args[0]
+        (collection,) = figure.axes[0].collections
+        assert len(collection.get_paths()) == 3
+        expected = to_rgba_array(
+            [
+                mock_config.colors.target_color,
+                mock_config.colors.neighbor_color,
+                mock_config.colors.neighbor_color,
+            ]
         )
-        mock_close.assert_called_once()
+        np.testing.assert_allclose(collection.get_facecolors(), expected)
 
+    def test_create_map_with_labels(
+        self,
+        mock_savefig: MagicMock,
+        mock_countries: gpd.GeoDataFrame,
+        mock_target_country: gpd.GeoDataFrame,
+        mock_neighbor_names: list[str],
+        mock_config: MapConfiguration,
+    ) -> None:
+        """Test map creation with labels and title."""
+        from maps.renderer import create_map
 
-class TestParseArgs:
-    """Test suite for the parse_args function."""
+        # Zoom out far enough for every country's label to fall inside the view
+        config = replace(mock_config, target_percentage=0.05)
 
-    def test_required_country_arg(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        """Test that the country argument is required."""
-        # Mock command line arguments
-        monkeypatch.setattr("sys.argv", ["maps/draw_map.py", "Germany"])
+        create_map(mock_countries, mock_target_country, mock_neighbor_names, config)
 
-        # Parse arguments
-        args = parse_args()
+        ax = mock_savefig.call_args.args[0].axes[0]
+        assert ax.get_title() == "Test Map"
+        assert {text.get_text() for text in ax.texts} == {"Germany", "France", "Poland"}
 
-        # Verify country argument
-        assert args.country == "Germany"
+    def test_create_map_uses_precomputed_bounds(
+        self,
+        mock_savefig: MagicMock,
+        mock_countries: gpd.GeoDataFrame,
+        mock_neighbor_names: list[str],
+    ) -> None:
+        """Test that bounds columns from load_country_data are preferred over GEOS."""
+        from maps.renderer import create_map
+
+        countries = mock_countries.copy()
+        # Deliberately differ from Germany's real bounds (10, 50, 15, 55)
+        countries[BOUNDS_COLUMNS] = [[0.0, 0.0, 4.0, 4.0]] * len(countries)
+        target_country = countries[countries["name"] == "Germany"]
+        config = make_config(target_percentage=0.25)
+
+        create_map(countries, target_country, mock_neighbor_names, config)
+
+        ax = mock_savefig.call_args.args[0].axes[0]
+        assert ax.get_xlim() == pytest.approx((-2.0, 6.0))
+        assert ax.get_ylim() == pytest.approx((-2.0, 6.0))
+
+    @pytest.mark.parametrize(
+        "name,expected",
+        [
+            ("Democratic Republic of the Congo", "Democ..."),
+            ("Saint Vincent and the Grenadines", "Saint"),
+        ],
+    )
+    def test_create_map_shortens_long_names(
+        self,
+        name: str,
+        expected: str,
+        mock_savefig: MagicMock,
+        mock_countries: gpd.GeoDataFrame,
+        mock_target_country: gpd.GeoDataFrame,
+    ) -> None:
+        """Test that names longer than 15 characters are cut down to fit on the map."""
+        from maps.renderer import create_map
 
-    def test_default_values(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        """Test default values for optional arguments."""
-        # Mock command line arguments
-        monkeypatch.setattr("sys.argv", ["maps/draw_map.py", "Germany"])
+        countries = mock_countries.copy()
+        countries.loc[countries["name"] == "France", "name"] = name
+        config = make_config(target_percentage=0.05)
 
-        # Parse arguments
-        args = parse_args()
+        create_map(countries, mock_target_country, [name, "Poland"], config)
 
-        # Verify default values
-        assert args.output is None
-        assert args.db_path == "natural_earth_vector.sqlite"
-        assert args.dpi == 300
+        ax = mock_savefig.call_args.args[0].axes[0]
+        assert {text.get_text() for text in ax.texts} == {"Germany", expected, "Poland"}
 
-    def test_custom_values(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        """Test custom values for optional arguments."""
-        # Mock command line arguments
-        monkeypatch.setattr(
-            "sys.argv",
-            [
-                "maps/draw_map.py",
-                "Germany",
-                "-o",
-                "/tmp/custom.png",
-                "--db-path",
-                "custom.db",
-                "--dpi",
-                "600",
-            ],
-        )
+    def test_create_map_excludes_exclaves(
+        self,
+        mock_savefig: MagicMock,
+        mock_countries: gpd.GeoDataFrame,
+        mock_neighbor_names: list[str],
+    ) -> None:
+        """Test that the view is fitted to the main territory when exclaves are excluded."""
+        import geopandas as gpd
 
-        # Parse arguments
-        args = parse_args()
+        from maps.renderer import create_map
 
-        # Verify custom values
-        assert args.country == "Germany"
-        assert args.output == "/tmp/custom.png"
-        assert args.db_path == "custom.db"
-        assert args.dpi == 600
+        # Germany plus a far-away island; the island must not widen the view
+        island = shapely.box(30, 30, 31, 31)
+        target_country = gpd.GeoDataFrame(
+            {"name": ["Germany"], "geometry": [MultiPolygon([island, _GERMANY_POLY])]}
+        )
+        config = make_config(target_percentage=0.25, exclude_exclaves=True)
 
+        create_map(mock_countries, target_country, mock_neighbor_names, config)
 
-class TestMainFunction:
-    """Test suite for the main function."""
+        ax = mock_savefig.call_args.args[0].axes[0]
+        assert ax.get_xlim() == pytest.approx((7.5, 17.5))
+        assert ax.get_ylim() == pytest.approx((47.5, 57.5))
 
-    @patch("maps.cli.load_country_data")
-    @patch("maps.cli.create_map")
-    def test_main_success(
+    def test_create_map_with_code_labels(
         self,
-        mock_create_map: MagicMock,
-        mock_load_country_data: MagicMock,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_savefig: MagicMock,
+        mock_countries: gpd.GeoDataFrame,
+        mock_target_country: gpd.GeoDataFrame,
+        mock_neighbor_names: list[str],
     ) -> None:
-        """Test successful execution of the main function."""
-        # Mock command line arguments
-        monkeypatch.setattr("sys.argv", ["maps/cli.py", "Germany"])
-
-        # Mock the return value of load_country_data
-        mock_countries = MagicMock()
-        mock_target_country = MagicMock()
-        mock_neighbor_names = ["France", "Poland"]
-        mock_load_country_data.return_value = (
-            mock_countries,
-            mock_target_country,
-            mock_neighbor_names,
-        )
+        """Test that label_type="code" labels countries with their ISO codes."""
+        from maps.renderer import create_map
 
-        # Run main function
-        main()
+        config = make_config(target_percentage=0.05, label_type="code")
 
-        # Verify that load_country_data was called
-        mock_load_country_data.assert_called_once_with(
-            "Germany", "natural_earth_vector.sqlite"
-        )
+        create_map(mock_countries, mock_target_country, mock_neighbor_names, config)
 
-        # Verify that create_map was called with the right parameters
-        mock_create_map.assert_called_once()
-        args, kwargs = mock_create_map.call_args
-        assert args[0] == mock_countries
-        assert args[1] == mock_target_country
-        assert args[2] == mock_neighbor_names
-        assert isinstance(args[3], MapConfiguration)
-        assert args[3].title == "Germany and Its Neighbors"
+        ax = mock_savefig.call_args.args[0].axes[0]
+        assert {text.get_text() for text in ax.texts} == {"DEU", "FRA", "POL"}
 
-    @patch("maps.cli.load_country_data")
-    @patch("maps.cli.create_map")
-    def test_main_custom_output(
+    def test_create_map_does_not_modify_inputs(
         self,
-        mock_create_map: MagicMock,
-        mock_load_country_data: MagicMock,
-        monkeypatch: pytest.MonkeyPatch,
+        mock_savefig: MagicMock,
+        mock_countries: gpd.GeoDataFrame,
+        mock_target_country: gpd.GeoDataFrame,
+        mock_neighbor_names: list[str],
+        mock_config: MapConfiguration,
     ) -> None:
-        """Test main function with custom output path."""
-        # Mock command line arguments with custom output
-        monkeypatch.setattr(
-            "sys.argv", ["maps/cli.py", "Germany", "-o", "/tmp/custom.png"]
-        )
+        """Test that the shared fixtures survive create_map unchanged."""
+        import pandas as pd
 
-        # Mock the return value of load_country_data
-        mock_countries = MagicMock()
-        mock_target_country = MagicMock()
-        mock_neighbor_names = ["France", "Poland"]
-        mock_load_country_data.return_value = (
-            mock_countries,
-            mock_target_country,
-            mock_neighbor_names,
+        from maps.renderer import create_map
+
+        countries_before = mock_countries.copy()
+        target_before = mock_target_country.copy()
+
+        create_map(
+            mock_countries, mock_target_country, mock_neighbor_names, mock_config
         )
 
-        # Run main function
-        main()
+        pd.testing.assert_frame_equal(mock_countries, countries_before)
+        pd.testing.assert_frame_equal(mock_target_country, target_before)
+        assert mock_neighbor_names == ["France", "Poland"]
 
-        # Verify that create_map was called with the right output path
-        args, kwargs = mock_create_map.call_args
-        assert args[3].output_path == "/tmp/custom.png"
+    def test_build_country_paths_with_holes(self) -> None:
+        """Test that rings are oriented so holes are cut out of the filled area."""
+        from maps.renderer import _build_country_paths
 
-    @patch("maps.cli.load_country_data")
-    @patch("maps.cli.create_map")
-    def test_main_target_percentage(
-        self,
-        mock_create_map: MagicMock,
-        mock_load_country_data: MagicMock,
-        monkeypatch: pytest.MonkeyPatch,
-    ) -> None:
-        """Test main function with custom target percentage."""
-        # Mock command line arguments with custom target percentage
-        monkeypatch.setattr(
-            "sys.argv", ["maps/cli.py", "Germany", "--target-percentage", "0.5"]
+        # Both rings counter-clockwise, so the hole must be reversed
+        with_hole = Polygon(
+            [(0, 0), (10, 0), (10, 10), (0, 10)],
+            [[(2, 2), (4, 2), (4, 4), (2, 4)]],
         )
+        geometries = np.array([None, with_hole], dtype=object)
 
-        # Mock the return value of load_country_data
-        mock_countries = MagicMock()
-        mock_target_country = MagicMock()
-        mock_neighbor_names = ["France", "Poland"]
-        mock_load_country_data.return_value = (
-            mock_countries,
-            mock_target_country,
-            mock_neighbor_names,
-        )
+        paths, drawn = _build_country_paths(geometries)
 
-        # Run main function
-        main()
+        assert drawn.tolist() == [1]
+        assert len(paths) == 1
+        exterior, hole = np.split(paths[0].vertices, 2)
+        assert LinearRing(exterior).is_ccw
+        assert not LinearRing(hole).is_ccw
+        assert paths[0].codes[[0, 4, 5, 9]].tolist() == [
+            Path.MOVETO,
+            Path.CLOSEPOLY,
+            Path.MOVETO,
+            Path.CLOSEPOLY,
+        ]
 
-        # Verify that create_map was called with the right target percentage
-        args, kwargs = mock_create_map.call_args
-        assert args[3].target_percentage == 0.5
 
-    @patch("maps.cli.load_country_data")
-    @patch("maps.cli.create_map")
-    def test_main_exclude_exclaves(
-        self,
-        mock_create_map: MagicMock,
-        mock_load_country_data: MagicMock,
-        monkeypatch: pytest.MonkeyPatch,
-    ) -> None:
-        """Test main function with exclude exclaves flag."""
-        # Mock command line arguments with exclude exclaves explicitly set to true
-        monkeypatch.setattr(
-            "sys.argv", ["maps/cli.py", "Germany", "--exclude-exclaves", "true"]
-        )
+    def test_build_country_paths_multipolygon(self) -> None:
+        """Test that all parts of a country end up in a single path."""
+        from maps.renderer import _build_country_paths
 
-        # Mock the return value of load_country_data
-        mock_countries = MagicMock()
-        mock_target_country = MagicMock()
-        mock_neighbor_names = ["France", "Poland"]
-        mock_load_country_data.return_value = (
-            mock_countries,
-            mock_target_country,
-            mock_neighbor_names,
+        geometries = np.array(
+            [MultiPolygon([_GERMANY_POLY, _POLAND_POLY]), None, _FRANCE_POLY], dtype=object
         )
 
-        # Run main function
-        main()
+        paths, drawn = _build_country_paths(geometries)
 
-        # Verify that create_map was called with exclude_exclaves=True
-        args, kwargs = mock_create_map.call_args
-        assert args[3].exclude_exclaves is True
+        assert drawn.tolist() == [0, 2]
+        assert [len(path.vertices) for path in paths] == [10, 5]
+        assert (paths[0].codes == Path.MOVETO).sum() == 2
 
-    @patch("maps.cli.load_country_data")
-    @patch("maps.cli.create_map")
-    def test_main_include_exclaves(
-        self,
-        mock_create_map: MagicMock,
-        mock_load_country_data: MagicMock,
-        monkeypatch: pytest.MonkeyPatch,
-    ) -> None:
-        """Test main function with exclude exclaves set to false (including exclaves)."""
-        # Mock command line arguments with exclude exclaves set to false
-        monkeypatch.setattr(
-            "sys.argv", ["maps/cli.py", "Germany", "--exclude-exclaves", "false"]
-        )
+    def test_build_country_paths_without_coordinates(self) -> None:
+        """Test that countries without coordinates produce no paths at all."""
+        from maps.renderer import _build_country_paths
 
-        # Mock the return value of load_country_data
-        mock_countries = MagicMock()
-        mock_target_country = MagicMock()
-        mock_neighbor_names = ["France", "Poland"]
-        mock_load_country_data.return_value = (
-            mock_countries,
-            mock_target_country,
-            mock_neighbor_names,
-        )
+        geometries = np.array([None, Polygon()], dtype=object)
 
-        # Run main function
-        main()
+        paths, drawn = _build_country_paths(geometries)
 
-        # Verify that create_map was called with exclude_exclaves=False
-        args, kwargs = mock_create_map.call_args
-        assert args[3].exclude_exclaves is False
+        assert paths == []
+        assert drawn.size == 0
 
-    @patch("maps.cli.load_country_data")
-    @patch("maps.cli.create_map")
-    def test_main_no_labels(
+class TestParseArgs:
+    """Test suite for the parse_args function."""
+
+    @pytest.mark.parametrize(
+        "argv,expected",
+        [
+            (
+                ["maps/draw_map.py", "Germany"],
+                {
+                    "country": "Germany",
+                    "output": None,
+                    "db_path": "natural_earth_vector.sqlite",
+                    "dpi": 300,
+                },
+            ),
+            (
+                [
+                    "maps/draw_map.py",
+                    "Germany",
+                    "-o",
+                    "/tmp/custom.png",
+                    "--db-path",
+                    "custom.db",
+                    "--dpi",
+                    "600",
+                ],
+                {
+                    "country": "Germany",
+                    "output": "/tmp/custom.png",
+                    "db_path": "custom.db",
+                    "dpi": 600,
+                },
+            ),
+        ],
+        ids=["defaults", "custom_values"],
+    )
+    def test_parse_args(
         self,
-        mock_create_map: MagicMock,
-        mock_load_country_data: MagicMock,
-        monkeypatch: pytest.MonkeyPatch,
+        argv: list[str],
+        expected: dict[str, object],
+        set_argv: Callable[[list[str]], None],
     ) -> None:
-        """Test main function with no labels flag."""
-        # Mock command line arguments with no labels
-        monkeypatch.setattr("sys.argv", ["maps/cli.py", "Germany", "--no-labels"])
-
-        # Mock the return value of load_country_data
-        mock_countries = MagicMock()
-        mock_target_country = MagicMock()
-        mock_neighbor_names = ["France", "Poland"]
-        mock_load_country_data.return_value = (
-            mock_countries,
-            mock_target_country,
-            mock_neighbor_names,
-        )
-
-        # Run main function
-        main()
+        """Test parsing the country argument with default and custom optional values."""
+        from maps.cli import parse_args
 
-        # Verify that create_map was called with show_labels=False
-        args, kwargs = mock_create_map.call_args
-        assert args[3].show_labels is False
+        set_argv(argv)
 
-    @patch("maps.cli.load_country_data")
-    @patch("maps.cli.create_map")
-    def test_main_label_size(
-        self,
-        mock_create_map: MagicMock,
-        mock_load_country_data: MagicMock,
-        monkeypatch: pytest.MonkeyPatch,
-    ) -> None:
-        """Test main function with custom label size."""
-        # Mock command line arguments with custom label size
-        monkeypatch.setattr(
-            "sys.argv", ["maps/cli.py", "Germany", "--label-size", "12.0"]
-        )
+        args = parse_args()
 
-        # Mock the return value of load_country_data
-        mock_countries = MagicMock()
-        mock_target_country = MagicMock()
-        mock_neighbor_names = ["France", "Poland"]
-        mock_load_country_data.return_value = (
-            mock_countries,
-            mock_target_country,
-            mock_neighbor_names,
-        )
+        for name, value in expected.items():
+            assert getattr(args, name) == value
+
+    def test_parser_reused_without_leaking_values(self) -> None:
+        """Test that the cached parser gives every call fresh defaults."""
+        from maps.cli import _get_parser, parse_args
+
+        custom = parse_args(["Germany", "--dpi", "600", "--no-labels"])
+        default = parse_args(["France"])
+
+        assert _get_parser.cache_info().currsize == 1
+        assert (custom.dpi, custom.show_labels) == (600, False)
+        assert (default.country, default.dpi, default.show_labels) == ("France", 300, True)
+
+
+# Single command-line options of main() and the MapConfiguration value they set
+MAIN_OPTION_CASES = [
+    pytest.param(
+        ["-o", "/tmp/custom.png"], "output_path", "/tmp/custom.png", id="output_path"
+    ),
+    pytest.param(
+        ["--target-percentage", "0.5"], "target_percentage", 0.5, id="target_percentage"
+    ),
+    pytest.param(
+        ["--exclude-exclaves", "true"], "exclude_exclaves", True, id="exclude_exclaves"
+    ),
+    pytest.param(
+        ["--exclude-exclaves", "false"], "exclude_exclaves", False, id="include_exclaves"
+    ),
+    pytest.param(["--no-labels"], "show_labels", False, id="no_labels"),
+    pytest.param(["--label-size", "12.0"], "label_size", 12.0, id="label_size"),
+    pytest.param(["--label-type", "code"], "label_type", "code", id="label_type"),
+    pytest.param(["--border-width", "1.5"], "border_width", 1.5, id="border_width"),
+]
 
-        # Run main function
-        main()
 
-        # Verify that create_map was called with the right label size
-        args, kwargs = mock_create_map.call_args
-        assert args[3].label_size == 12.0
+class TestMainFunction:
+    """Test suite for the main function."""
 
-    @patch("maps.cli.load_country_data")
-    @patch("maps.cli.create_map")
-    def test_main_label_type(
+    @pytest.mark.parametrize(
+        "country,side_effect",
+        [
+            ("Germany", None),
+            ("NonExistentCountry", ValueError("Country not found")),
+        ],
+        ids=["success", "error_handling"],
+    )
+    def test_main(
         self,
-        mock_create_map: MagicMock,
-        mock_load_country_data: MagicMock,
-        monkeypatch: pytest.MonkeyPatch,
+        patched_cli: SimpleNamespace,
+        parsed_args: Callable[..., argparse.Namespace],
+        country: str,
+        side_effect: Optional[Exception],
     ) -> None:
-        """Test main function with custom label type."""
-        # Mock command line arguments with custom label type
-        monkeypatch.setattr(
-            "sys.argv", ["maps/cli.py", "Germany", "--label-type", "code"]
-        )
+        """Test that main renders the loaded country and survives loading errors."""
+        from maps.cli import main
 
-        # Mock the return value of load_country_data
-        mock_countries = MagicMock()
-        mock_target_country = MagicMock()
-        mock_neighbor_names = ["France", "Poland"]
-        mock_load_country_data.return_value = (
-            mock_countries,
-            mock_target_country,
-            mock_neighbor_names,
-        )
+        # Arguments of 'maps/cli.py <country>', without going through argparse
+        parsed_args(country=country)
+        patched_cli.load_country_data.side_effect = side_effect
 
-        # Run main function
+        # Run main function (should not raise an exception)
         main()
 
-        # Verify that create_map was called with the right label type
-        args, kwargs = mock_create_map.call_args
-        assert args[3].label_type == "code"
-
-    @patch("maps.cli.load_country_data")
-    @patch("maps.cli.create_map")
-    def test_main_border_width(
-        self,
-        mock_create_map: MagicMock,
-        mock_load_country_data: MagicMock,
-        monkeypatch: pytest.MonkeyPatch,
-    ) -> None:
-        """Test main function with custom border width."""
-        # Mock command line arguments with custom border width
-        monkeypatch.setattr(
-            "sys.argv", ["maps/cli.py", "Germany", "--border-width", "1.5"]
-        )
-
-        # Mock the return value of load_country_data
-        mock_countries = MagicMock()
-        mock_target_country = MagicMock()
-        mock_neighbor_names = ["France", "Poland"]
-        mock_load_country_data.return_value = (
-            mock_countries,
-            mock_target_country,
-            mock_neighbor_names,
+        # Verify that load_country_data was called
+        assert patched_cli.load_country_data.call_count == 1
+        assert patched_cli.load_country_data.call_args == call(
+            country, "natural_earth_vector.sqlite", language="en"
         )
 
-        # Run main function
-        main()
+        if side_effect is not None:
+            # Nothing is rendered when loading fails
+            assert patched_cli.create_map.call_count == 0
+            return
 
-        # Verify that create_map was called with the right border width
-        args, kwargs = mock_create_map.call_args
-        assert args[3].border_width == 1.5
+        # Verify that create_map was called with the right parameters
+        countries, target_country, neighbor_names = (
+            patched_cli.load_country_data.return_value
+        )
+        assert patched_cli.create_map.call_count == 1
+        args, kwargs = patched_cli.create_map.call_args
+        assert args[0] is countries
+        assert args[1] is target_country
+        assert args[2] == neighbor_names
+        assert isinstance(args[3], MapConfiguration)
+        assert args[3].title == f"{country} and Its Neighbors"
 
-    @patch("maps.cli.load_country_data")
-    def test_main_error_handling(
-        self, mock_load_country_data: MagicMock, monkeypatch: pytest.MonkeyPatch
+    @pytest.mark.parametrize("extra_argv,attr,expected", MAIN_OPTION_CASES)
+    def test_main_option(
+        self,
+        patched_cli: SimpleNamespace,
+        set_argv: Callable[[list[str]], None],
+        extra_argv: list[str],
+        attr: str,
+        expected: object,
     ) -> None:
-        """Test error handling in the main function."""
-        # Mock command line arguments
-        monkeypatch.setattr("sys.argv", ["maps/cli.py", "NonExistentCountry"])
+        """Test that each command-line option reaches the map configuration."""
+        from maps.cli import main
 
-        # Mock load_country_data to raise an exception
-        mock_load_country_data.side_effect = ValueError("Country not found")
+        set_argv(["maps/cli.py", "Germany", *extra_argv])
 
-        # Run main function (should not raise an exception)
         main()
 
-        # Verify that load_country_data was called
-        mock_load_country_data.assert_called_once_with(
-            "NonExistentCountry", "natural_earth_vector.sqlite"
-        )
+        config = patched_cli.create_map.call_args.args[3]
+        assert getattr(config, attr) == expected
 
-    @patch("maps.cli.load_country_data")
-    @patch("maps.cli.create_map")
     def test_main_all_options(
-        self,
-        mock_create_map: MagicMock,
-        mock_load_country_data: MagicMock,
-        monkeypatch: pytest.MonkeyPatch,
+        self, patched_cli: SimpleNamespace, set_argv: Callable[[list[str]], None]
     ) -> None:
         """Test main function with all options specified."""
+        from maps.cli import main
+
         # Mock command line arguments with all options
-        monkeypatch.setattr(
-            "sys.argv",
+        set_argv(
             [
                 "maps/cli.py",
                 "Germany",
@@ -795,25 +736,13 @@ class TestMainFunction:
                 "code",
                 "--border-width",
                 "0.8",
-            ],
+            ]
         )
 
-        # Mock the return value of load_country_data
-        mock_countries = MagicMock()
-        mock_target_country = MagicMock()
-        mock_neighbor_names = ["France", "Poland", "Austria", "Switzerland"]
-        mock_load_country_data.return_value = (
-            mock_countries,
-            mock_target_country,
-            mock_neighbor_names,
-        )
-
-        # Run main function
         main()
 
         # Verify that create_map was called with all the right parameters
-        args, kwargs = mock_create_map.call_args
-        config = args[3]
+        config = patched_cli.create_map.call_args.args[3]
         assert config.output_path == "/tmp/germany_map.png"
         assert config.title == "Germany and Its Neighbors"
         assert config.dpi == 600
@@ -825,4 +754,7 @@ class TestMainFunction:
         assert config.border_width == 0.8
 
         # Verify load_country_data was called with the right parameters
-        mock_load_country_data.assert_called_once_with("Germany", "custom.sqlite")
+        assert patched_cli.load_country_data.call_count == 1
+        assert patched_cli.load_country_data.call_args == call(
+            "Germany", "custom.sqlite", language="en"
+        )
@@ -1,18 +1,30 @@
 """Tests for the find_neighbors module."""
 
+import copy
+import os
+import pickle
 import sqlite3
-from typing import Dict, List, Optional, Tuple
+from dataclasses import FrozenInstanceError
+from itertools import starmap
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from unittest.mock import MagicMock, call, patch
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 import pytest
+import shapely
 from pandas import DataFrame
 from shapely.geometry import Polygon
+from shapely.strtree import STRtree
 
 from maps.find_neighbors import (
     CountryRecord,
+    _envelopes_intersect,
+    _get_parser,
     format_iso_code,
+    get_countries_df,
     get_neighboring_countries,
     list_country_names,
     main,
@@ -20,19 +32,52 @@ from maps.find_neighbors import (
 )
 
 # Import TEST_DB_PATH from conftest instead
-from tests.conftest import TEST_DB_PATH
+from tests.conftest import COUNTRY_NAME_ROWS, TEST_DB_PATH
+
+# Countries for the 'touches' neighbor search: France and Poland share a border with
+# Germany, Italy only touches France. All of them are boxes, built in one vectorized
+# call from (minx, miny, maxx, maxy).
+_TOUCHES_BOXES = {
+    "Germany": (10, 50, 15, 55),
+    "France": (5, 45, 10, 50),
+    "Poland": (15, 50, 20, 55),
+    "Italy": (5, 40, 15, 45),
+}
+_TOUCHES_COUNTRIES = gpd.GeoDataFrame(
+    {
+        "ogc_fid": [1, 2, 3, 4],
+        "name": list(_TOUCHES_BOXES),
+        "name_long": [
+            "Federal Republic of Germany",
+            "French Republic",
+            "Republic of Poland",
+            "Italian Republic",
+        ],
+        "iso_a3": ["DEU", "FRA", "POL", "ITA"],
+        "display_iso": ["DEU", "FRA", "POL", "ITA"],
+        "geometry": shapely.box(*np.array(list(_TOUCHES_BOXES.values())).T),
+    }
+)
 
 
 # Mock implementations for the functions that are not defined in the module
 def mock_format_neighbors_string(neighbors: List[Tuple[str, str]]) -> str:
-    """Format a list of neighbors into a readable string."""
-    if not neighbors:
-        return "None"
-    return ", ".join([f"{name} ({code})" for code, name in neighbors])
+    """
+    Format a list of neighbors into a readable string.
+
+    Takes the (name, iso_code) pairs returned by get_neighboring_countries, so each
+    pair is passed to the format in order without unpacking and reordering it.
+    """
+    return ", ".join(starmap("{} ({})".format, neighbors)) or "None"
 
 
 def mock_create_neighbors_table_if_not_exists(conn: sqlite3.Connection) -> None:
-    """Create the neighbors table if it doesn't exist."""
+    """
+    Create the neighbors table and its bounding box index if they don't exist.
+
+    country_bbox is an R*Tree virtual table holding each country's envelope, so
+    bounding box lookups are index scans instead of full scans. The caller commits.
+    """
     cursor = conn.cursor()
     cursor.execute(
         """
@@ -43,37 +88,77 @@ def mock_create_neighbors_table_if_not_exists(conn: sqlite3.Connection) -> None:
         )
         """
     )
-    conn.commit()
+    cursor.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS country_bbox USING rtree(
+            id, minx, maxx, miny, maxy, +iso_a3
+        )
+        """
+    )
+
+
+def mock_insert_country_bboxes(conn: sqlite3.Connection, df: gpd.GeoDataFrame) -> None:
+    """Insert the envelope of every country into country_bbox; the caller commits."""
+    bounds = df.geometry.bounds
+    cursor = conn.cursor()
+    cursor.executemany(
+        "INSERT OR REPLACE INTO country_bbox VALUES (?, ?, ?, ?, ?, ?)",
+        zip(
+            range(1, len(df) + 1),
+            bounds["minx"].tolist(),
+            bounds["maxx"].tolist(),
+            bounds["miny"].tolist(),
+            bounds["maxy"].tolist(),
+            df["iso_a3"].tolist(),
+        ),
+    )
 
 
 def mock_insert_neighbor_data(
-    conn: sqlite3.Connection, neighbors_data: List[Tuple[str, str]]
+    conn: sqlite3.Connection, neighbors_data: Iterable[Tuple[str, str]]
 ) -> None:
-    """Insert neighbor data into the database."""
+    """Insert neighbor data into the database; the caller commits."""
     cursor = conn.cursor()
-    for country_iso, neighbor_iso in neighbors_data:
-        cursor.execute(
-            "INSERT OR REPLACE INTO neighbors (country_iso, neighbor_iso) VALUES (?, ?)",
-            (country_iso, neighbor_iso),
-        )
-    conn.commit()
+    # One prepared statement bound to every row
+    cursor.executemany(
+        "INSERT OR REPLACE INTO neighbors (country_iso, neighbor_iso) VALUES (?, ?)",
+        neighbors_data,
+    )
 
 
 def mock_handle_neighbors_table(
-    df: pd.DataFrame, conn: sqlite3.Connection, clean: bool = False
+    df: pd.DataFrame,
+    conn: sqlite3.Connection,
+    clean: bool = False,
+    neighbors_data: Optional[Iterable[Tuple[str, str]]] = None,
 ) -> None:
-    """Handle the neighbors table creation and population."""
-    cursor = conn.cursor()
-    if clean:
-        cursor.execute("DROP TABLE IF EXISTS neighbors")
+    """
+    Handle the neighbors table creation and population.
 
-    # Create table
-    mock_create_neighbors_table_if_not_exists(conn)
+    The drop, create and insert run in one transaction: the connection context manager
+    commits once at the end (one sync to disk) or rolls everything back on error.
 
-    # Process data and insert
-    neighbors_data = mock_process_country_data(df)
-    mock_insert_neighbor_data(conn, neighbors_data)
-    conn.commit()
+    Args:
+        df: Countries with iso_a3 and geometry columns
+        conn: Connection to the database holding the neighbors table
+        clean: Drop the existing tables first
+        neighbors_data: Precomputed (country_iso, neighbor_iso) pairs; computed from
+            df when not given
+    """
+    with conn:
+        cursor = conn.cursor()
+        if clean:
+            cursor.execute("DROP TABLE IF EXISTS neighbors")
+            cursor.execute("DROP TABLE IF EXISTS country_bbox")
+
+        # Create tables
+        mock_create_neighbors_table_if_not_exists(conn)
+
+        # Process data and insert
+        if neighbors_data is None:
+            neighbors_data = mock_process_country_data(df)
+        mock_insert_neighbor_data(conn, neighbors_data)
+        mock_insert_country_bboxes(conn, df)
 
 
 def mock_get_country_name(iso_code: str, country_map: Dict[str, str]) -> str:
@@ -81,19 +166,42 @@ def mock_get_country_name(iso_code: str, country_map: Dict[str, str]) -> str:
     return country_map.get(iso_code, iso_code)
 
 
-def mock_process_country_data(df: pd.DataFrame) -> List[Tuple[str, str]]:
-    """Process country data to find neighbors."""
-    result = []
+def mock_process_country_data(df: gpd.GeoDataFrame) -> Set[Tuple[str, str]]:
+    """
+    Process country data to find neighbors.
+
+    Countries are neighbors when their geometries touch. All touching pairs are found
+    with one bulk query against an STRtree, instead of comparing every pair of rows.
+    The pairs are returned as a set, so countries split over several rows yield each
+    pair once and membership checks are hash lookups.
+    """
+    geometries = df.geometry.to_numpy()
+    iso_codes = df["iso_a3"].to_numpy()
 
-    # In a real implementation, this would use geometric operations
-    # For the test, we'll just generate some sample data
-    iso_codes = df["iso_a3"].tolist()
-    for i, code1 in enumerate(iso_codes):
-        for code2 in iso_codes:
-            if code1 != code2:  # Skip self-pairs
-                result.append((code1, code2))
+    # Both directions of every touching pair, as (input index, tree index) rows
+    country_idx, neighbor_idx = STRtree(geometries).query(geometries, predicate="touches")
 
-    return result
+    return set(zip(iso_codes[country_idx].tolist(), iso_codes[neighbor_idx].tolist()))
+
+
+def make_touching_countries() -> gpd.GeoDataFrame:
+    """
+    Build three mutually touching countries and one isolated country.
+
+    DEU and FRA are unit squares side by side and BEL lies along both of their top
+    edges, so every pair of them shares a border; ISL touches nothing.
+    """
+    return gpd.GeoDataFrame(
+        {
+            "iso_a3": ["DEU", "FRA", "BEL", "ISL"],
+            "geometry": [
+                Polygon([(0, 0), (1, 0), (1, 1), (0, 1)]),
+                Polygon([(1, 0), (2, 0), (2, 1), (1, 1)]),
+                Polygon([(0, 1), (2, 1), (2, 2), (0, 2)]),
+                Polygon([(10, 10), (11, 10), (11, 11), (10, 11)]),
+            ],
+        }
+    )
 
 
 class TestCountryRecord:
@@ -117,109 +225,49 @@ class TestCountryRecord:
         )
         assert record.display_iso == expected_display
 
+    def test_slots_copy_and_pickle(self) -> None:
+        """Test that slotted records have no __dict__ but still copy and pickle."""
+        record = CountryRecord(
+            name="Germany", name_long="Federal Republic of Germany", iso_code="DEU"
+        )
+
+        assert not hasattr(record, "__dict__")
+        assert copy.copy(record) == record
+        assert pickle.loads(pickle.dumps(record)) == record
+        with pytest.raises(FrozenInstanceError):
+            record.name = "France"  # type: ignore[misc]
+
 
 class TestListCountryNames:
     """Test suite for the list_country_names function."""
 
-    @patch("sqlite3.connect")
+    @pytest.mark.parametrize(
+        ("db_rows", "limit", "expected_len"),
+        [(3, 20, 3), (5, 2, 2), (5, None, 5)],
+        ids=["default_limit", "custom_limit", "no_limit"],
+    )
     @patch("pandas.read_sql")
-    def test_list_country_names_success(
-        self, mock_read_sql: MagicMock, mock_connect: MagicMock
+    def test_list_country_names(
+        self,
+        mock_read_sql: MagicMock,
+        db_rows: int,
+        limit: Optional[int],
+        expected_len: int,
+        mock_db_connection: MagicMock,
+        country_names_df: DataFrame,
     ) -> None:
-        """Test successful retrieval of country names."""
-        # Mock the database connection and query result
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-
-        # Create mock DataFrame with sample countries
-        mock_data = {
-            "name": ["Germany", "France", "Spain"],
-            "name_long": [
-                "Federal Republic of Germany",
-                "French Republic",
-                "Kingdom of Spain",
-            ],
-            "iso_a3": ["DEU", "FRA", "ESP"],
-        }
-        mock_df = DataFrame(mock_data)
-        mock_read_sql.return_value = mock_df
+        """Test retrieval of country names with and without a limit."""
+        # Only the first db_rows sample countries are in the database
+        mock_read_sql.return_value = country_names_df.iloc[:db_rows].copy(deep=False)
 
-        # Call the function with default limit
-        result = list_country_names(db_path="test.db", limit=20)
+        result = list_country_names(db_path="test.db", limit=limit)
 
         # Verify connection and query
-        mock_connect.assert_called_once_with("test.db")
+        mock_db_connection.assert_called_once_with("test.db")
         mock_read_sql.assert_called_once()
 
-        # Verify result format and content
-        assert len(result) == 3
-        assert result[0] == ["Germany", "Federal Republic of Germany", "DEU"]
-        assert result[1] == ["France", "French Republic", "FRA"]
-        assert result[2] == ["Spain", "Kingdom of Spain", "ESP"]
-
-    @patch("sqlite3.connect")
-    @patch("pandas.read_sql")
-    def test_list_country_names_with_limit(
-        self, mock_read_sql: MagicMock, mock_connect: MagicMock
-    ) -> None:
-        """Test retrieval of country names with a custom limit."""
-        # Mock the database connection and query result
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-
-        # Create mock DataFrame with sample countries
-        mock_data = {
-            "name": ["Germany", "France", "Spain", "Italy", "Portugal"],
-            "name_long": [
-                "Federal Republic of Germany",
-                "French Republic",
-                "Kingdom of Spain",
-                "Italian Republic",
-                "Portuguese Republic",
-            ],
-            "iso_a3": ["DEU", "FRA", "ESP", "ITA", "PRT"],
-        }
-        mock_df = DataFrame(mock_data)
-        mock_read_sql.return_value = mock_df
-
-        # Call the function with a limit of 2
-        result = list_country_names(db_path="test.db", limit=2)
-
-        # Verify result contains only the first 2 countries
-        assert len(result) == 2
-        assert result[0] == ["Germany", "Federal Republic of Germany", "DEU"]
-        assert result[1] == ["France", "French Republic", "FRA"]
-
-    @patch("sqlite3.connect")
-    @patch("pandas.read_sql")
-    def test_list_country_names_no_limit(
-        self, mock_read_sql: MagicMock, mock_connect: MagicMock
-    ) -> None:
-        """Test retrieval of all country names without a limit."""
-        # Mock the database connection and query result
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-
-        # Create mock DataFrame with sample countries
-        mock_data = {
-            "name": ["Germany", "France", "Spain", "Italy", "Portugal"],
-            "name_long": [
-                "Federal Republic of Germany",
-                "French Republic",
-                "Kingdom of Spain",
-                "Italian Republic",
-                "Portuguese Republic",
-            ],
-            "iso_a3": ["DEU", "FRA", "ESP", "ITA", "PRT"],
-        }
-        mock_df = DataFrame(mock_data)
-        mock_read_sql.return_value = mock_df
-
-        # Call the function with no limit
-        result = list_country_names(db_path="test.db", limit=None)
-
-        # Verify result contains all countries
-        assert len(result) == 5
+        # Rows come back as lists in query order, cut off at the limit
+        assert result == [list(row) for row in COUNTRY_NAME_ROWS[:expected_len]]
 
     @patch("sqlite3.connect")
     def test_list_country_names_error(self, mock_connect: MagicMock) -> None:
@@ -243,23 +291,25 @@ class TestGetCountryNamesMap:
         # This test now just checks if our mocking setup works as expected
 
         # Setup mock cursor and execution
-        mock_cursor = MagicMock()
         mock_conn = mock_db_connection.return_value
-        mock_conn.cursor.return_value = mock_cursor
-
-        # Mock query results
-        mock_cursor.fetchall.return_value = [
-            ("USA", "United States"),
-            ("CAN", "Canada"),
-            ("DEU", "Germany"),
-        ]
+        mock_cursor = mock_conn.cursor.return_value
+
+        # Mock query results, yielded by iterating the cursor
+        mock_cursor.__iter__.return_value = iter(
+            [
+                ("USA", "United States"),
+                ("CAN", "Canada"),
+                ("DEU", "Germany"),
+            ]
+        )
 
         # Define a mock function to simulate get_country_names_map
         def mock_get_country_names_map(db_path: str) -> Dict[str, str]:
             conn = mock_db_connection(db_path)
             cursor = conn.cursor()
             cursor.execute("SELECT iso_a3, name FROM ne_10m_admin_0_countries")
-            result = {iso: name for iso, name in cursor.fetchall()}
+            # Build the dict straight from the cursor's rows, without a fetchall list
+            result = dict(cursor)
             conn.close()
             return result
 
@@ -275,19 +325,18 @@ class TestGetCountryNamesMap:
     def test_get_country_names_map_empty(self, mock_db_connection: MagicMock) -> None:
         """Test empty result from database."""
         # Setup mock cursor and execution
-        mock_cursor = MagicMock()
         mock_conn = mock_db_connection.return_value
-        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor = mock_conn.cursor.return_value
 
         # Mock empty results
-        mock_cursor.fetchall.return_value = []
+        mock_cursor.__iter__.return_value = iter([])
 
         # Define a mock function to simulate get_country_names_map
         def mock_get_country_names_map(db_path: str) -> Dict[str, str]:
             conn = mock_db_connection(db_path)
             cursor = conn.cursor()
             cursor.execute("SELECT iso_a3, name FROM ne_10m_admin_0_countries")
-            result = {iso: name for iso, name in cursor.fetchall()}
+            result = dict(cursor)
             conn.close()
             return result
 
@@ -313,7 +362,7 @@ class TestGetCountryNamesMap:
                 cursor = conn.cursor()
                 # This will raise the mocked exception
                 cursor.execute("SELECT iso_a3, name FROM ne_10m_admin_0_countries")
-                result = {iso: name for iso, name in cursor.fetchall()}
+                result = dict(cursor)
                 conn.close()
                 return result
             except Exception as e:
@@ -326,14 +375,84 @@ class TestGetCountryNamesMap:
         assert "Failed to get country names" in str(excinfo.value)
 
 
+@pytest.fixture
+def countries_sqlite(tmp_path: Path) -> str:
+    """Create a Natural Earth-like countries table with WKB geometries."""
+    db_path = tmp_path / "countries.sqlite"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE ne_10m_admin_0_countries "
+        "(ogc_fid INTEGER, name TEXT, name_long TEXT, iso_a3 TEXT, GEOMETRY BLOB)"
+    )
+    conn.executemany(
+        "INSERT INTO ne_10m_admin_0_countries VALUES (?, ?, ?, ?, ?)",
+        [
+            (1, "Germany", "Germany", "DEU", shapely.box(0, 0, 1, 1).wkb),
+            (2, "Kosovo", "Republic of Kosovo", "-99", shapely.box(1, 0, 2, 1).wkb),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return str(db_path)
+
+
+class TestGetCountriesDf:
+    """Test suite for the get_countries_df function and its parquet cache."""
+
+    def test_cache_reused_until_database_changes(
+        self, countries_sqlite: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the cache is read back while fresh and rebuilt once stale."""
+        cache_path = str(tmp_path / "countries.parquet")
+
+        built = get_countries_df(countries_sqlite, cache_path)
+        assert built["display_iso"].tolist() == ["DEU", "N/A"]
+
+        # A fresh cache is read without touching the database
+        connect = MagicMock(side_effect=AssertionError("database was opened"))
+        monkeypatch.setattr("sqlite3.connect", connect)
+        cached = get_countries_df(countries_sqlite, cache_path)
+        assert cached["name"].tolist() == ["Germany", "Kosovo"]
+        assert cached["geometry"].iloc[1].equals(shapely.box(1, 0, 2, 1))
+
+        # A database newer than the cache is read again
+        monkeypatch.undo()
+        conn = sqlite3.connect(countries_sqlite)
+        conn.execute("DELETE FROM ne_10m_admin_0_countries WHERE name = 'Kosovo'")
+        conn.commit()
+        conn.close()
+        newer = os.path.getmtime(cache_path) + 10
+        os.utime(countries_sqlite, (newer, newer))
+
+        rebuilt = get_countries_df(countries_sqlite, cache_path)
+        assert rebuilt["name"].tolist() == ["Germany"]
+
+    def test_empty_blobs_become_missing_geometries(
+        self, countries_sqlite: str, tmp_path: Path
+    ) -> None:
+        """Test that an empty blob does not pick up the previous row's geometry."""
+        conn = sqlite3.connect(countries_sqlite)
+        conn.execute(
+            "INSERT INTO ne_10m_admin_0_countries VALUES (3, 'Nowhere', 'Nowhere', '', x'')"
+        )
+        conn.commit()
+        conn.close()
+
+        df = get_countries_df(countries_sqlite, str(tmp_path / "countries.parquet"))
+
+        assert df["name"].tolist() == ["Germany", "Kosovo", "Nowhere"]
+        assert df["geometry"].iloc[1].equals(shapely.box(1, 0, 2, 1))
+        assert df["geometry"].iloc[2] is None
+
+
+@pytest.mark.geo
 class TestGetNeighboringCountries:
     """Tests for the get_neighboring_countries function."""
 
-    @patch("os.path.exists")
-    def test_db_not_found(self, mock_exists: MagicMock) -> None:
+    def test_db_not_found(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test behavior when the database file is not found."""
         # Mock os.path.exists to return False
-        mock_exists.return_value = False
+        monkeypatch.setattr("os.path.exists", lambda _path: False)
 
         # Call the function
         result = get_neighboring_countries("Germany", "nonexistent.db")
@@ -342,7 +461,6 @@ class TestGetNeighboringCountries:
         assert isinstance(result, str)
         assert "Database file not found" in result
 
-    @patch("os.path.exists")
     @patch("sqlite3.connect")
     @patch("pandas.read_sql")
     @patch("maps.find_neighbors.get_countries_df")
@@ -351,11 +469,11 @@ class TestGetNeighboringCountries:
         mock_get_countries_df: MagicMock,
         mock_read_sql: MagicMock,
         mock_connect: MagicMock,
-        mock_exists: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test behavior when the specified country is not found."""
         # Mock file existence and connection
-        mock_exists.return_value = True
+        monkeypatch.setattr("os.path.exists", lambda _path: True)
         mock_conn = MagicMock()
         mock_connect.return_value = mock_conn
 
@@ -385,44 +503,17 @@ class TestGetNeighboringCountries:
         assert isinstance(result, str)
         assert "Country 'Germany' not found" in result
 
-    @patch("os.path.exists")
     @patch("maps.find_neighbors.get_countries_df")
     def test_successful_neighbors_finding_with_touches(
-        self, mock_get_countries_df: MagicMock, mock_exists: MagicMock
+        self, mock_get_countries_df: MagicMock, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Test successful finding of neighbors using the 'touches' method."""
         # Mock file existence
-        mock_exists.return_value = True
-
-        # Create mock polygons for countries
-        germany_poly = Polygon([(10, 50), (10, 55), (15, 55), (15, 50)])
-        france_poly = Polygon([(5, 45), (5, 50), (10, 50), (10, 45)])  # Touches Germany
-        poland_poly = Polygon(
-            [(15, 50), (15, 55), (20, 55), (20, 50)]
-        )  # Touches Germany
-        italy_poly = Polygon(
-            [(5, 40), (5, 45), (15, 45), (15, 40)]
-        )  # Doesn't touch Germany
-
-        # Create mock GeoDataFrame
-        mock_gdf = gpd.GeoDataFrame(
-            {
-                "ogc_fid": [1, 2, 3, 4],
-                "name": ["Germany", "France", "Poland", "Italy"],
-                "name_long": [
-                    "Federal Republic of Germany",
-                    "French Republic",
-                    "Republic of Poland",
-                    "Italian Republic",
-                ],
-                "iso_a3": ["DEU", "FRA", "POL", "ITA"],
-                "display_iso": ["DEU", "FRA", "POL", "ITA"],
-                "geometry": [germany_poly, france_poly, poland_poly, italy_poly],
-            }
-        )
+        monkeypatch.setattr("os.path.exists", lambda _path: True)
 
-        # Mock the get_countries_df function to return our mock GeoDataFrame
-        mock_get_countries_df.return_value = mock_gdf
+        # get_neighboring_countries sets the CRS on the frame it gets, so hand it a
+        # copy; the geometries themselves are immutable and stay shared
+        mock_get_countries_df.return_value = _TOUCHES_COUNTRIES.copy()
 
         # Define which countries should be neighbors based on our mock polygons
         # France and Poland touch Germany in our mock setup
@@ -439,14 +530,13 @@ class TestGetNeighboringCountries:
         for neighbor in expected_neighbors:
             assert neighbor in result, f"Expected {neighbor} in {result}"
 
-    @patch("os.path.exists")
     @patch("maps.find_neighbors.get_countries_df")
     def test_error_handling(
-        self, mock_get_countries_df: MagicMock, mock_exists: MagicMock
+        self, mock_get_countries_df: MagicMock, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Test handling of errors during neighbor finding."""
         # Mock file existence
-        mock_exists.return_value = True
+        monkeypatch.setattr("os.path.exists", lambda _path: True)
 
         # Mock get_countries_df to raise an exception
         mock_get_countries_df.side_effect = Exception("Test database error")
@@ -481,60 +571,70 @@ class TestFormatISOCode:
         assert format_iso_code(safe_iso_code) == expected_output
 
 
-class TestParseArgs:
-    """Test suite for the parse_args function."""
-
-    def test_default_args(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        """Test parsing with default arguments."""
-        # Mock command line arguments
-        monkeypatch.setattr("sys.argv", ["maps.find_neighbors.py"])
+class TestEnvelopesIntersect:
+    """Test suite for the _envelopes_intersect bounding box filter."""
 
-        # Parse arguments
-        args = parse_args()
+    def test_envelopes_intersect(self) -> None:
+        """Test that touching and overlapping envelopes match and others do not."""
+        envelopes = shapely.bounds(
+            np.array(
+                [
+                    shapely.box(1, 0, 2, 1),  # shares an edge
+                    shapely.box(0.5, 0.5, 3, 3),  # overlaps
+                    shapely.box(1, 1, 2, 2),  # shares a corner
+                    shapely.box(5, 5, 6, 6),  # far away
+                    None,  # missing geometry
+                ]
+            )
+        )
 
-        # Verify default values
-        assert args.country == "Germany"
-        assert not args.list
-        assert not args.list_all
+        mask = _envelopes_intersect(envelopes, (0.0, 0.0, 1.0, 1.0))
 
-    def test_custom_country(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        """Test parsing with a custom country argument."""
-        # Mock command line arguments
-        monkeypatch.setattr("sys.argv", ["maps.find_neighbors.py", "France"])
+        assert mask.tolist() == [True, True, True, False, False]
 
-        # Parse arguments
-        args = parse_args()
 
-        # Verify custom country
-        assert args.country == "France"
-        assert not args.list
-        assert not args.list_all
+class TestParseArgs:
+    """Test suite for the parse_args function."""
 
-    def test_list_flag(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        """Test parsing with the --list flag."""
-        # Mock command line arguments
-        monkeypatch.setattr("sys.argv", ["maps.find_neighbors.py", "--list"])
+    @pytest.mark.parametrize(
+        ("argv", "expected_country", "expected_list", "expected_list_all"),
+        [
+            (["maps.find_neighbors.py"], "Germany", False, False),
+            (["maps.find_neighbors.py", "France"], "France", False, False),
+            (["maps.find_neighbors.py", "--list"], "Germany", True, False),
+            (["maps.find_neighbors.py", "--list-all"], "Germany", False, True),
+        ],
+        ids=["default_args", "custom_country", "list_flag", "list_all_flag"],
+    )
+    def test_parse_args(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        argv: List[str],
+        expected_country: str,
+        expected_list: bool,
+        expected_list_all: bool,
+    ) -> None:
+        """Test parsing of the country argument and the list flags."""
+        monkeypatch.setattr("sys.argv", argv)
 
-        # Parse arguments
         args = parse_args()
 
-        # Verify list flag
-        assert args.country == "Germany"  # Default country
-        assert args.list
-        assert not args.list_all
+        assert args.country == expected_country
+        assert args.list is expected_list
+        assert args.list_all is expected_list_all
 
-    def test_list_all_flag(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        """Test parsing with the --list-all flag."""
-        # Mock command line arguments
-        monkeypatch.setattr("sys.argv", ["maps.find_neighbors.py", "--list-all"])
-
-        # Parse arguments
-        args = parse_args()
+    def test_parser_reused_without_leaking_values(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the cached parser gives every call fresh defaults."""
+        monkeypatch.setattr("sys.argv", ["maps.find_neighbors.py", "France", "--list"])
+        custom = parse_args()
+        monkeypatch.setattr("sys.argv", ["maps.find_neighbors.py"])
+        default = parse_args()
 
-        # Verify list-all flag
-        assert args.country == "Germany"  # Default country
-        assert not args.list
-        assert args.list_all
+        assert _get_parser.cache_info().currsize == 1
+        assert (custom.country, custom.list) == ("France", True)
+        assert (default.country, default.list) == ("Germany", False)
 
 
 class TestMainFunction:
@@ -634,11 +734,11 @@ class TestFormatNeighborsString:
         "neighbors, expected_output",
         [
             (
-                [("FRA", "France"), ("BEL", "Belgium"), ("NLD", "Netherlands")],
+                [("France", "FRA"), ("Belgium", "BEL"), ("Netherlands", "NLD")],
                 "France (FRA), Belgium (BEL), Netherlands (NLD)",
             ),
             (
-                [("FRA", "France")],
+                [("France", "FRA")],
                 "France (FRA)",
             ),
             (
@@ -664,16 +764,18 @@ class TestCreateNeighborsTable:
     ) -> None:
         """Test creating the neighbors table."""
         # Setup mock cursor
-        mock_cursor = MagicMock()
         mock_conn = mock_db_connection.return_value
-        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor = mock_conn.cursor.return_value
 
         # Call function
         mock_create_neighbors_table_if_not_exists(mock_conn)
 
-        # Assertions
-        mock_cursor.execute.assert_called_once()
-        mock_conn.commit.assert_called_once()
+        # Assertions; committing is left to the caller's transaction
+        assert mock_cursor.execute.call_count == 2
+        statements = [args[0] for args, _ in mock_cursor.execute.call_args_list]
+        assert "CREATE TABLE IF NOT EXISTS neighbors" in statements[0]
+        assert "USING rtree(" in statements[1]
+        mock_conn.commit.assert_not_called()
 
 
 class TestInsertNeighborData:
@@ -682,9 +784,8 @@ class TestInsertNeighborData:
     def test_insert_neighbor_data(self, mock_db_connection: MagicMock) -> None:
         """Test inserting neighbor data into the database."""
         # Setup mock cursor
-        mock_cursor = MagicMock()
         mock_conn = mock_db_connection.return_value
-        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor = mock_conn.cursor.return_value
 
         # Call function
         neighbors_data = [
@@ -695,24 +796,21 @@ class TestInsertNeighborData:
         mock_insert_neighbor_data(mock_conn, neighbors_data)
 
         # Assertions
-        assert mock_cursor.execute.call_count == 3
-        mock_conn.commit.assert_called_once()
+        mock_cursor.executemany.assert_called_once()
+        assert mock_cursor.executemany.call_args.args[1] == neighbors_data
+        mock_cursor.execute.assert_not_called()
+        mock_conn.commit.assert_not_called()
 
 
 class TestHandleNeighborsTable:
     """Tests for the handle_neighbors_table function."""
 
-    @patch("sqlite3.connect")
-    def test_handle_neighbors_table_clean(self, mock_db_connection: MagicMock) -> None:
+    def test_handle_neighbors_table_clean(
+        self, mock_conn_cursor: tuple[MagicMock, MagicMock]
+    ) -> None:
         """Test handling neighbors table with clean option."""
         # Setup mock cursor
-        mock_cursor = MagicMock()
-        mock_conn = mock_db_connection.return_value
-        mock_conn.cursor.return_value = mock_cursor
-
-        # Reset all mocks to clear any previous calls
-        mock_cursor.reset_mock()
-        mock_conn.reset_mock()
+        mock_conn, mock_cursor = mock_conn_cursor
 
         # Sample data
         df = pd.DataFrame(
@@ -767,19 +865,12 @@ class TestHandleNeighborsTable:
         # Verify commit was called
         mock_conn.commit.assert_called_once()
 
-    @patch("sqlite3.connect")
     def test_handle_neighbors_table_no_clean(
-        self, mock_db_connection: MagicMock
+        self, mock_conn_cursor: tuple[MagicMock, MagicMock]
     ) -> None:
         """Test handling neighbors table without clean option."""
         # Setup mock cursor
-        mock_cursor = MagicMock()
-        mock_conn = mock_db_connection.return_value
-        mock_conn.cursor.return_value = mock_cursor
-
-        # Reset all mocks to clear any previous calls
-        mock_cursor.reset_mock()
-        mock_conn.reset_mock()
+        mock_conn, mock_cursor = mock_conn_cursor
 
         # Setup to check if table exists
         mock_cursor.fetchone.return_value = (0,)  # Table doesn't exist
@@ -842,6 +933,28 @@ class TestHandleNeighborsTable:
         # Verify commit was called
         mock_conn.commit.assert_called_once()
 
+    def test_handle_neighbors_table_builds_bbox_index(self) -> None:
+        """Test that country envelopes can be looked up through the R*Tree index."""
+        conn = sqlite3.connect(":memory:")
+        try:
+            # Only the envelopes are under test, so skip the neighbor search
+            mock_handle_neighbors_table(
+                make_touching_countries(),
+                conn,
+                clean=True,
+                neighbors_data=[("DEU", "FRA"), ("FRA", "DEU")],
+            )
+
+            # Countries whose envelope overlaps the box around DEU and FRA's shared edge
+            rows = conn.execute(
+                "SELECT iso_a3 FROM country_bbox "
+                "WHERE maxx >= 0.9 AND minx <= 1.1 AND maxy >= 0.4 AND miny <= 0.6"
+            ).fetchall()
+            assert sorted(iso for (iso,) in rows) == ["DEU", "FRA"]
+            assert conn.execute("SELECT COUNT(*) FROM neighbors").fetchone() == (2,)
+        finally:
+            conn.close()
+
 
 class TestGetCountryName:
     """Tests for the get_country_name function."""
@@ -864,40 +977,19 @@ class TestProcessCountryData:
 
     def test_process_country_data(self) -> None:
         """Test processing country data to find neighbors."""
-        # Mock GeoDataFrame with simplified geometry data
-        with patch("geopandas.GeoDataFrame.iterrows") as mock_iterrows:
-            with patch("shapely.geometry.Polygon.intersects") as mock_intersects:
-                # Setup mock data
-                mock_iterrows.return_value = [
-                    (0, {"iso_a3": "DEU", "geometry": "poly1"}),
-                    (1, {"iso_a3": "FRA", "geometry": "poly2"}),
-                    (2, {"iso_a3": "BEL", "geometry": "poly3"}),
-                ]
+        result = mock_process_country_data(make_touching_countries())
 
-                # Mock all countries to be neighbors (for simplicity)
-                mock_intersects.return_value = True
-
-                # Call function with a dummy dataframe
-                df = pd.DataFrame(
-                    {
-                        "iso_a3": ["DEU", "FRA", "BEL"],
-                        "geometry": ["poly1", "poly2", "poly3"],
-                    }
-                )
-
-                with patch("pandas.DataFrame", return_value=df):
-                    with patch("geopandas.GeoDataFrame", return_value=df):
-                        result = mock_process_country_data(df)
-
-                # We should have 6 neighbor pairs (each country with each other country)
-                # But we exclude self-pairs, so 6 total
-                assert len(result) == 6
-                assert ("DEU", "FRA") in result
-                assert ("DEU", "BEL") in result
-                assert ("FRA", "DEU") in result
-                assert ("FRA", "BEL") in result
-                assert ("BEL", "DEU") in result
-                assert ("BEL", "FRA") in result
+        # Each of the three touching countries neighbors the other two, in both
+        # directions, and the isolated country has no neighbors
+        assert result == {
+            ("BEL", "DEU"),
+            ("BEL", "FRA"),
+            ("DEU", "BEL"),
+            ("DEU", "FRA"),
+            ("FRA", "BEL"),
+            ("FRA", "DEU"),
+        }
+        assert "ISL" not in {country for country, _ in result}
 
 
 class TestMain:
@@ -914,8 +1006,7 @@ class TestMain:
         with patch("geopandas.read_file") as mock_read_file:
             with patch("sqlite3.connect") as mock_connect:
                 # Setup mocks
-                mock_df = MagicMock()
-                mock_read_file.return_value = mock_df
+                mock_read_file.return_value = make_touching_countries()
                 mock_conn = MagicMock()
                 mock_connect.return_value = mock_conn
 
@@ -933,8 +1024,23 @@ class TestMain:
                 # Assertions
                 mock_read_file.assert_called_once()
                 mock_connect.assert_called_once_with(TEST_DB_PATH)
+                # The table is rebuilt in a single transaction, committed on exit
+                mock_conn.__enter__.assert_called_once()
+                mock_conn.__exit__.assert_called_once_with(None, None, None)
+                mock_conn.commit.assert_not_called()
                 mock_conn.close.assert_called_once()
 
+                # Rows are bound in bulk: one executemany per table, no per-row execute
+                mock_cursor = mock_conn.cursor.return_value
+                neighbors_call, bbox_call = mock_cursor.executemany.call_args_list
+                assert "INTO neighbors" in neighbors_call.args[0]
+                assert len(set(neighbors_call.args[1])) == 6
+                assert "INTO country_bbox" in bbox_call.args[0]
+                assert not any(
+                    "INSERT" in execute_call.args[0]
+                    for execute_call in mock_cursor.execute.call_args_list
+                )
+
     def test_main_with_exception(self) -> None:
         """Test handling of exceptions in main function."""
         with patch("geopandas.read_file") as mock_read_file:
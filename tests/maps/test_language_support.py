@@ -1,13 +1,18 @@
-"""Tests for multilingual label support functionality."""
+"""
+Tests for multilingual label support functionality.
 
-from unittest.mock import MagicMock, patch
+geopandas and the maps modules that depend on it are imported inside the tests that
+use them, so the language configuration tests do not load the geodata stack.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+from unittest.mock import DEFAULT, MagicMock, create_autospec, patch, sentinel
 
-import geopandas as gpd
 import pytest
-from shapely.geometry import Polygon
 
-from maps.cli import generate_map, parse_args
-from maps.draw_map import load_country_data
 from maps.language_config import (
     get_language_column,
     get_supported_languages,
@@ -15,16 +20,42 @@ from maps.language_config import (
 )
 from maps.models import MapConfiguration
 
+if TYPE_CHECKING:
+    import geopandas as gpd
+    import numpy as np
+
+
+@pytest.fixture(scope="module")
+def shared_ax() -> MagicMock:
+    """
+    Build an autospec'd axes once for the renderer tests in this module.
+
+    Building the spec walks every Axes method, so it is done once and the call history
+    is cleared per test instead (see mock_ax).
+    """
+    from matplotlib.axes import Axes
+
+    return create_autospec(Axes, instance=True)
+
+
+@pytest.fixture
+def mock_ax(shared_ax: MagicMock) -> MagicMock:
+    """Provide the shared autospec'd axes, which rejects calls Axes does not support."""
+    shared_ax.reset_mock()
+    return shared_ax
+
 
 class TestLanguageConfig:
     """Test suite for language configuration module."""
 
     def test_get_supported_languages(self) -> None:
-        """Test retrieving the list of supported languages."""
+        """Test retrieving the supported languages."""
         languages = get_supported_languages()
 
-        # Verify that the returned list contains expected languages
-        assert isinstance(languages, list)
+        # Verify that the returned codes are immutable, sorted and include expected ones
+        assert isinstance(languages, tuple)
+        assert list(languages) == sorted(languages)
+        assert get_supported_languages() is languages
         assert "en" in languages
         assert "fr" in languages
         assert "es" in languages
@@ -41,6 +72,7 @@ class TestLanguageConfig:
         assert is_language_supported("xx") is False
         assert is_language_supported("") is False
         assert is_language_supported(None) is False  # type: ignore
+        assert is_language_supported(["en"]) is False  # type: ignore
 
     def test_get_language_column(self) -> None:
         """Test getting the correct database column for a language."""
@@ -61,6 +93,8 @@ class TestCLILanguageArguments:
 
     def test_parse_args_with_language(self) -> None:
         """Test parsing command-line arguments with language option."""
+        from maps.cli import parse_args
+
         # Test with valid language
         args = parse_args(["map", "Germany", "--language", "fr"])
         assert args.language == "fr"
@@ -76,26 +110,51 @@ class TestCLILanguageArguments:
     @patch("sys.stderr")
     def test_parse_args_with_invalid_language(self, mock_stderr: MagicMock) -> None:
         """Test parsing command-line arguments with invalid language option."""
+        from maps.cli import parse_args
+
         with pytest.raises(SystemExit):
             parse_args(["map", "Germany", "--language", "xx"])
 
     def test_list_languages_option(self) -> None:
         """Test the --list-languages option."""
+        from maps.cli import parse_args
+
         with pytest.raises(SystemExit):
             # This should exit, but we just want to verify the option is recognized
             parse_args(["--list-languages"])
 
 
-@pytest.fixture
-def mock_countries_df() -> gpd.GeoDataFrame:
-    """Create a mock GeoDataFrame with countries for testing."""
-    # Create mock polygons for countries
-    germany_poly = Polygon([(10, 50), (10, 55), (15, 55), (15, 50)])
-    france_poly = Polygon([(5, 45), (5, 50), (10, 50), (10, 45)])
-    poland_poly = Polygon([(15, 50), (15, 55), (20, 55), (20, 50)])
+@pytest.fixture(scope="module")
+def country_polygons() -> np.ndarray:
+    """
+    Build the Germany, France and Poland test polygons in one vectorized call.
+
+    The polygons are immutable, so they are built once per module and shared.
+    """
+    import shapely
+
+    return shapely.polygons(
+        [
+            [(10, 50), (10, 55), (15, 55), (15, 50), (10, 50)],
+            [(5, 45), (5, 50), (10, 50), (10, 45), (5, 45)],
+            [(15, 50), (15, 55), (20, 55), (20, 50), (15, 50)],
+        ]
+    )
+
+
+@pytest.fixture(scope="module")
+def mock_countries_df(country_polygons: np.ndarray) -> gpd.GeoDataFrame:
+    """
+    Create a mock GeoDataFrame with countries for testing.
+
+    The frame is shared across the module, so tests pass on a copy wherever it may be
+    modified.
+    """
+    import geopandas as gpd
+    import shapely
 
     # Create mock GeoDataFrame with multilingual names
-    return gpd.GeoDataFrame(
+    countries = gpd.GeoDataFrame(
         {
             "name": ["Germany", "France", "Poland"],
             "name_en": ["Germany", "France", "Poland"],
@@ -104,43 +163,29 @@ def mock_countries_df() -> gpd.GeoDataFrame:
             "name_es": ["Alemania", "Francia", "Polonia"],
             "iso_a3": ["DEU", "FRA", "POL"],
             "display_iso": ["DEU", "FRA", "POL"],
-            "GEOMETRY": [
-                germany_poly,
-                france_poly,
-                poland_poly,
-            ],  # Add GEOMETRY column for the tests
-            "geometry": [germany_poly, france_poly, poland_poly],
-        }
+        },
+        geometry=country_polygons,
     )
+    # The raw WKB column that load_country_data reads from the database
+    countries["GEOMETRY"] = shapely.to_wkb(country_polygons)
+    return countries
 
 
 class TestDrawMapWithLanguage:
     """Test suite for draw_map module with language support."""
 
-    @patch("maps.draw_map.get_neighboring_countries")
-    @patch("maps.draw_map.pd.read_sql")
-    @patch("sqlite3.connect")
-    @patch("maps.draw_map.wkb.loads")
     def test_load_country_data_with_language(
         self,
-        mock_loads: MagicMock,
-        mock_connect: MagicMock,
-        mock_read_sql: MagicMock,
-        mock_get_neighboring_countries: MagicMock,
+        patched_draw_map_db: SimpleNamespace,
         mock_countries_df: gpd.GeoDataFrame,
     ) -> None:
         """Test loading country data with a specific language."""
-        # Setup mocks
-        mock_db = MagicMock()
-        mock_connect.return_value = mock_db
+        from maps.draw_map import load_country_data
 
-        # Mock wkb.loads to return the polygon directly
-        mock_loads.side_effect = lambda x: x
-
-        mock_read_sql.return_value = mock_countries_df
+        patched_draw_map_db.set_rows(mock_countries_df)
 
         # Mock neighboring countries result
-        mock_get_neighboring_countries.return_value = [
+        patched_draw_map_db.get_neighboring_countries.return_value = [
             ("France", "FR"),
             ("Poland", "PL"),
         ]
@@ -149,7 +194,7 @@ class TestDrawMapWithLanguage:
         countries, target, neighbors = load_country_data("Germany", language="de")
 
         # Verify that the appropriate language column was requested
-        args, kwargs = mock_read_sql.call_args
+        args, kwargs = patched_draw_map_db.execute.call_args
         query = args[0]
         assert "name_de" in query, "Query should include the language-specific column"
 
@@ -161,33 +206,31 @@ class TestDrawMapWithLanguage:
         assert "Frankreich" in countries["display_name"].values
         assert "Polen" in countries["display_name"].values
 
-    @patch("maps.draw_map.get_neighboring_countries")
-    @patch("maps.draw_map.pd.read_sql")
-    @patch("sqlite3.connect")
-    @patch("maps.draw_map.wkb.loads")
+    def test_query_prebuilt_per_language(self) -> None:
+        """Test that every supported language has a prebuilt query for its column."""
+        from maps.draw_map import _COUNTRIES_QUERIES
+
+        for code in get_supported_languages():
+            column = get_language_column(code)
+            assert f"iso_a3, {column}, GEOMETRY" in _COUNTRIES_QUERIES[column]
+        assert "name" in _COUNTRIES_QUERIES
+
     def test_display_name_fallback(
         self,
-        mock_loads: MagicMock,
-        mock_connect: MagicMock,
-        mock_read_sql: MagicMock,
-        mock_get_neighboring_countries: MagicMock,
+        patched_draw_map_db: SimpleNamespace,
         mock_countries_df: gpd.GeoDataFrame,
     ) -> None:
         """Test fallback to English when a translation is missing."""
-        # Setup mocks
-        mock_db = MagicMock()
-        mock_connect.return_value = mock_db
-
-        # Mock wkb.loads to return the polygon directly
-        mock_loads.side_effect = lambda x: x
+        from maps.draw_map import load_country_data
 
         # Create a DataFrame with missing translations
         df_with_missing = mock_countries_df.copy()
         df_with_missing.loc[0, "name_fr"] = None  # Make one translation missing
-        mock_read_sql.return_value = df_with_missing
+        df_with_missing.loc[2, "name_fr"] = ""  # And one empty
+        patched_draw_map_db.set_rows(df_with_missing)
 
         # Mock neighboring countries result
-        mock_get_neighboring_countries.return_value = [
+        patched_draw_map_db.get_neighboring_countries.return_value = [
             ("France", "FR"),
             ("Poland", "PL"),
         ]
@@ -195,67 +238,65 @@ class TestDrawMapWithLanguage:
         # Call load_country_data with French language
         countries, target, neighbors = load_country_data("Germany", language="fr")
 
-        # Verify display_name uses English name for Germany (index 0) due to missing translation
+        # Verify display_name uses English names for Germany (index 0) and Poland
+        # (index 2) due to the missing and empty translations
         assert countries["display_name"].iloc[0] == "Germany"
-        # But uses French for others
+        assert countries["display_name"].iloc[2] == "Poland"
+        # But uses French for the others
         assert countries["display_name"].iloc[1] == "France"
-        assert countries["display_name"].iloc[2] == "Pologne"
 
 
 @pytest.mark.integration
 class TestMultilingualIntegration:
     """Integration tests for multilingual label support."""
 
-    @patch("maps.cli.load_country_data")
-    @patch("maps.cli.create_map")
-    def test_language_passed_to_load_country_data(
-        self,
-        mock_create_map: MagicMock,
-        mock_load_country_data: MagicMock,
-    ) -> None:
+    def test_language_passed_to_load_country_data(self) -> None:
         """Test that the language parameter is correctly passed to load_country_data."""
-        # Mock data
-        mock_countries = MagicMock()
-        mock_target_country = MagicMock()
-        mock_neighbor_names = ["France", "Belgium"]
-
-        mock_load_country_data.return_value = (
-            mock_countries,
-            mock_target_country,
-            mock_neighbor_names,
-        )
+        from maps.cli import generate_map
+
+        with patch.multiple("maps.cli", load_country_data=DEFAULT, create_map=DEFAULT) as mocks:
+            mock_load_country_data = mocks["load_country_data"]
+
+            # Mock data
+            mock_countries = sentinel.countries
+            mock_target_country = sentinel.target_country
+            mock_neighbor_names = ["France", "Belgium"]
+
+            mock_load_country_data.return_value = (
+                mock_countries,
+                mock_target_country,
+                mock_neighbor_names,
+            )
+
+            # Plain attribute container for the parsed arguments; nothing on it is asserted
+            args = SimpleNamespace(
+                country="Germany",
+                db_path="natural_earth_vector.sqlite",
+                language="fr",
+                exclude_exclaves=False,
+                output="/tmp/test_map.png",
+                dpi=300,
+                target_percentage=0.3,
+                show_labels=True,
+                label_size=8.0,
+                label_type="name",
+                border_width=0.5,
+                show_territory_info=False,
+            )
+
+            # Call generate_map with mock args
+            generate_map(args)
+
+            # Verify load_country_data was called with the language parameter
+            mock_load_country_data.assert_called_once()
+            args, kwargs = mock_load_country_data.call_args
+            assert args[0] == "Germany"  # Country name should be in English
+            assert kwargs.get("language") == "fr"  # Language should be passed
 
-        # Create mock args
-        class MockArgs:
-            country = "Germany"
-            db_path = "natural_earth_vector.sqlite"
-            language = "fr"
-            exclude_exclaves = False
-            output = "/tmp/test_map.png"
-            dpi = 300
-            target_percentage = 0.3
-            show_labels = True
-            label_size = 8.0
-            label_type = "name"
-            border_width = 0.5
-            show_territory_info = False
-
-        # Call generate_map with mock args
-        generate_map(MockArgs())
-
-        # Verify load_country_data was called with the language parameter
-        mock_load_country_data.assert_called_once()
-        args, kwargs = mock_load_country_data.call_args
-        assert args[0] == "Germany"  # Country name should be in English
-        assert kwargs.get("language") == "fr"  # Language should be passed
-
-    @patch("maps.renderer.plt")
-    @patch("maps.renderer.gpd.GeoDataFrame.plot")
     def test_renderer_uses_display_name(
         self,
-        mock_plot: MagicMock,
-        mock_plt: MagicMock,
         mock_countries_df: gpd.GeoDataFrame,
+        mock_ax: MagicMock,
     ) -> None:
         """Test that the renderer uses the display_name for labels."""
         # Add display_name column with German names
@@ -273,20 +314,19 @@ class TestMultilingualIntegration:
             language="de",
         )
 
-        # Mock the subplots and text methods
-        mock_fig = MagicMock()
-        mock_ax = MagicMock()
-        mock_plt.subplots.return_value = (mock_fig, mock_ax)
+        with patch("maps.renderer.Figure") as mock_figure:
+            # Draw onto the shared axes mock
+            mock_figure.return_value.subplots.return_value = mock_ax
 
-        # Import and call create_map
-        from maps.renderer import create_map
+            # Import and call create_map
+            from maps.renderer import create_map
 
-        create_map(df, target_country, neighbor_names, config)
+            create_map(df, target_country, neighbor_names, config)
 
-        # Check that the display_name is used in the text calls to the axis
-        # This is a simplistic check, as in reality we would need to mock and check
-        # the behavior of add_labels method which is where the text is actually added
-        mock_ax.text.assert_called()
+            # Check that the display_name is used in the text calls to the axis
+            # This is a simplistic check, as in reality we would need to mock and check
+            # the behavior of add_labels method which is where the text is actually added
+            mock_ax.text.assert_called()
 
 
 @pytest.mark.parametrize(
@@ -1,18 +1,53 @@
 """Tests for the territory_analyzer module."""
 
+import sqlite3
+import sys
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+from typing import Optional
 from unittest.mock import MagicMock, patch
 
+import geopandas as gpd
+import numpy as np
 import pytest
-from shapely.geometry import MultiPolygon, Polygon
+from shapely.geometry import MultiPolygon, Point, Polygon
 
 from maps.territory_analyzer import (
     CountryGeometryType,
     TerritoryAnalysisResult,
     TerritoryAnalyzer,
+    _classify_geometry_types,
+    _connect_readonly,
+    _max_centroid_distance,
+    get_country_territory_info,
+    load_country_geometries,
     load_country_geometry,
 )
 
 
+@pytest.fixture
+def countries_db(tmp_path: Path) -> str:
+    """Create a small Natural Earth-like SQLite database with WKB geometries."""
+    db_path = tmp_path / "countries.sqlite"
+    israel = Polygon([(34, 29), (34, 33), (36, 33), (36, 29)])
+    russia = MultiPolygon(
+        [
+            Polygon([(30, 50), (30, 70), (180, 70), (180, 50)]),
+            Polygon([(19, 54), (19, 56), (23, 56), (23, 54)]),
+        ]
+    )
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE ne_10m_admin_0_countries (name TEXT, GEOMETRY BLOB)")
+    conn.executemany(
+        "INSERT INTO ne_10m_admin_0_countries VALUES (?, ?)",
+        [("Israel", israel.wkb), ("Russia", russia.wkb), ("Dot", Point(0, 0).wkb)],
+    )
+    conn.commit()
+    conn.close()
+    return str(db_path)
+
+
 class TestCountryGeometryType:
     """Test suite for the CountryGeometryType enum."""
 
@@ -45,11 +80,6 @@ class TestTerritoryAnalysisResult:
 
     def test_custom_values(self) -> None:
         """Test custom values for TerritoryAnalysisResult."""
-        territories = [
-            {"area": 800.0, "percentage": 80.0, "centroid": (10.0, 50.0)},
-            {"area": 200.0, "percentage": 20.0, "centroid": (20.0, 60.0)},
-        ]
-
         result = TerritoryAnalysisResult(
             country_name="Test Country",
             geometry_type=CountryGeometryType.HAS_EXCLAVE,
@@ -58,7 +88,9 @@ class TestTerritoryAnalysisResult:
             main_polygon_percentage=80.0,
             polygon_count=2,
             max_distance_between_polygons=15.0,
-            separate_territories=territories,
+            territory_areas=np.array([800.0, 200.0]),
+            territory_percentages=np.array([80.0, 20.0]),
+            centroids=np.array([[10.0, 50.0], [20.0, 60.0]]),
         )
 
         assert result.country_name == "Test Country"
@@ -68,83 +100,119 @@ class TestTerritoryAnalysisResult:
         assert result.main_polygon_percentage == 80.0
         assert result.polygon_count == 2
         assert result.max_distance_between_polygons == 15.0
-        assert len(result.separate_territories) == 2
-        assert result.separate_territories[0]["area"] == 800.0
-        assert result.separate_territories[1]["percentage"] == 20.0
+        assert result.separate_territories == [
+            {"area": 800.0, "percentage": 80.0, "centroid": (10.0, 50.0)},
+            {"area": 200.0, "percentage": 20.0, "centroid": (20.0, 60.0)},
+        ]
+
+    def test_centroids_built_lazily(self) -> None:
+        """Test that the centroid factory runs once, on first access only."""
+        factory = MagicMock(return_value=np.array([[1.0, 2.0]]))
+
+        result = TerritoryAnalysisResult(
+            country_name="Test Country",
+            geometry_type=CountryGeometryType.CONTINUOUS,
+            total_area=1.0,
+            territory_areas=np.array([1.0]),
+            territory_percentages=np.array([100.0]),
+            centroids_factory=factory,
+        )
+        factory.assert_not_called()
+
+        assert result.territory_centroids is result.territory_centroids
+        factory.assert_called_once_with()
+
+    def test_results_are_immutable(self) -> None:
+        """Test that results are frozen and, on Python 3.10+, carry no __dict__."""
+        result = TerritoryAnalysisResult(
+            country_name="Test Country",
+            geometry_type=CountryGeometryType.CONTINUOUS,
+            total_area=1.0,
+        )
+
+        with pytest.raises(FrozenInstanceError):
+            result.total_area = 2.0  # type: ignore[misc]
+        if sys.version_info >= (3, 10):
+            assert not hasattr(result, "__dict__")
 
 
 class TestLoadCountryGeometry:
     """Test suite for the load_country_geometry function."""
 
-    @patch("os.path.exists")
-    def test_database_not_found(self, mock_exists: MagicMock) -> None:
+    def test_database_not_found(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test that FileNotFoundError is raised when the database doesn't exist."""
-        mock_exists.return_value = False
+        monkeypatch.setattr("os.path.exists", lambda _path: False)
 
         with pytest.raises(FileNotFoundError, match="Database file not found"):
             load_country_geometry("Israel", "nonexistent.db")
 
-    @patch("os.path.exists")
-    @patch("sqlite3.connect")
-    def test_country_not_found(
-        self,
-        mock_connect: MagicMock,
-        mock_exists: MagicMock,
-    ) -> None:
+    def test_country_not_found(self, countries_db: str) -> None:
         """Test that ValueError is raised when the country isn't in the database."""
-        mock_exists.return_value = True
+        with pytest.raises(ValueError, match="Country 'NonexistentCountry' not found"):
+            load_country_geometry("NonexistentCountry", countries_db)
 
-        # Mock database connection and cursor
-        mock_cursor = MagicMock()
-        mock_cursor.fetchone.return_value = None  # Simulate country not found
+    def test_successful_load_single_polygon(self, countries_db: str) -> None:
+        """Test successful loading of a country with a single polygon."""
+        geometry = load_country_geometry("Israel", countries_db)
 
-        mock_conn = MagicMock()
-        mock_conn.cursor.return_value = mock_cursor
-        mock_connect.return_value = mock_conn
+        # Verify the result
+        assert isinstance(geometry, Polygon)
+        assert geometry.equals(Polygon([(34, 29), (34, 33), (36, 33), (36, 29)]))
 
-        with pytest.raises(ValueError, match="Country 'NonexistentCountry' not found"):
-            load_country_geometry("NonexistentCountry", "test.db")
+    def test_unexpected_geometry_type(self, countries_db: str) -> None:
+        """Test that TypeError is raised for a non-polygonal geometry."""
+        with pytest.raises(TypeError, match="Expected Polygon or MultiPolygon"):
+            load_country_geometry("Dot", countries_db)
 
-    @patch("os.path.exists")
-    @patch("sqlite3.connect")
-    @patch("pandas.read_sql")
-    @patch("shapely.wkb.loads")
-    def test_successful_load_single_polygon(
-        self,
-        mock_loads: MagicMock,
-        mock_read_sql: MagicMock,
-        mock_connect: MagicMock,
-        mock_exists: MagicMock,
-    ) -> None:
-        """Test successful loading of a country with a single polygon."""
-        mock_exists.return_value = True
 
-        # Mock database connection
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
+class TestLoadCountryGeometries:
+    """Test suite for the load_country_geometries batch loader."""
 
-        # Create mock result with Israel as single polygon
-        israel_polygon = Polygon([(34, 29), (34, 33), (36, 33), (36, 29)])
-        mock_loads.return_value = israel_polygon
+    def test_database_not_found(self) -> None:
+        """Test that FileNotFoundError is raised when the database doesn't exist."""
+        with pytest.raises(FileNotFoundError, match="Database file not found"):
+            load_country_geometries(["Israel"], "nonexistent.db")
+
+    @pytest.mark.parametrize(
+        ("country_names", "expected_types"),
+        [
+            (["Israel"], {"Israel": Polygon}),
+            (["Israel", "Russia"], {"Israel": Polygon, "Russia": MultiPolygon}),
+            (["Israel", "Atlantis"], {"Israel": Polygon}),
+            ([], {}),
+        ],
+    )
+    def test_loads_requested_countries(
+        self,
+        countries_db: str,
+        country_names: list[str],
+        expected_types: dict[str, type],
+    ) -> None:
+        """Test that only the requested (and existing) countries are decoded."""
+        geometries = load_country_geometries(country_names, countries_db)
 
-        # Create mock DataFrame
-        from pandas import DataFrame
+        assert set(geometries) == set(expected_types)
+        for name, expected_type in expected_types.items():
+            assert isinstance(geometries[name], expected_type)
 
-        mock_df = DataFrame(
-            {
-                "name": ["Israel"],
-                "GEOMETRY": [b"mock_geometry"],
-            }
-        )
-        mock_read_sql.return_value = mock_df
+    def test_unexpected_geometry_type(self, countries_db: str) -> None:
+        """Test that TypeError is raised for non-polygonal geometries."""
+        with pytest.raises(TypeError, match="Expected Polygon or MultiPolygon for 'Dot'"):
+            load_country_geometries(None, countries_db)
 
-        # Call the function
-        geometry = load_country_geometry("Israel", "test.db")
+    def test_database_opened_read_only(self, countries_db: str) -> None:
+        """Test that the loaders' connection cannot modify the database."""
+        conn = _connect_readonly(countries_db)
+        try:
+            with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                conn.execute("DELETE FROM ne_10m_admin_0_countries")
+        finally:
+            conn.close()
 
-        # Verify the result
-        assert geometry is not None
-        assert isinstance(geometry, Polygon)
-        assert geometry == israel_polygon
+        assert set(load_country_geometries(["Israel", "Russia"], countries_db)) == {
+            "Israel",
+            "Russia",
+        }
 
 
 class TestTerritoryAnalyzer:
@@ -189,6 +257,9 @@ class TestTerritoryAnalyzer:
         assert result.main_polygon_percentage > 90.0  # Mainland should be > 90%
         assert result.max_distance_between_polygons > 0.0
         assert len(result.separate_territories) == 2
+        # The centroids computed for the distance are stored, not recomputed later
+        assert result.centroids_factory is None
+        np.testing.assert_allclose(result.territory_centroids, [[105.0, 60.0], [21.0, 55.0]])
 
     def test_analyze_island_nation(self) -> None:
         """Test analysis of an island nation (Indonesia)."""
@@ -235,6 +306,175 @@ class TestTerritoryAnalyzer:
         result_90 = analyzer_90.analyze("TestCountry", geometry)
         assert result_90.geometry_type == CountryGeometryType.ISLAND_NATION
 
+    def test_max_distance_between_centroids(self) -> None:
+        """Test that the maximum distance is measured between the farthest centroids."""
+        # Centroids at (0.5, 0.5), (3.5, 4.5) and (1.5, 0.5)
+        first = Polygon([(0, 0), (0, 1), (1, 1), (1, 0)])
+        second = Polygon([(3, 4), (3, 5), (4, 5), (4, 4)])
+        third = Polygon([(1.25, 0.25), (1.25, 0.75), (1.75, 0.75), (1.75, 0.25)])
+
+        analyzer = TerritoryAnalyzer()
+        result = analyzer.analyze("TestCountry", MultiPolygon([first, second, third]))
+
+        assert result.max_distance_between_polygons == pytest.approx(5.0)
+
+    @pytest.mark.parametrize("count", [2, 15, 200])
+    def test_max_centroid_distance_matches_all_pairs(self, count: int) -> None:
+        """Test that pruning to the convex hull keeps the farthest pair."""
+        centroid_xy = np.random.default_rng(count).uniform(-50, 50, size=(count, 2))
+        deltas = centroid_xy[:, None, :] - centroid_xy[None, :, :]
+        expected = np.sqrt((deltas**2).sum(axis=-1)).max()
+
+        assert _max_centroid_distance(centroid_xy) == pytest.approx(expected)
+
+    def test_max_centroid_distance_collinear(self) -> None:
+        """Test that collinear centroids, whose hull is a line, are measured end to end."""
+        centroid_xy = np.column_stack([np.arange(20.0), np.arange(20.0)])
+
+        assert _max_centroid_distance(centroid_xy) == pytest.approx(19 * np.sqrt(2))
+
+    def test_analyze_with_precomputed_arrays(self) -> None:
+        """Test that precomputed areas and centroids are used instead of recomputing."""
+        large = Polygon([(0, 0), (0, 10), (10, 10), (10, 0)])
+        small = Polygon([(20, 0), (20, 5), (25, 5), (25, 0)])
+
+        analyzer = TerritoryAnalyzer()
+        result = analyzer.analyze(
+            "TestCountry",
+            MultiPolygon([large, small]),
+            areas=np.array([90.0, 10.0]),
+            centroids=np.array([[0.0, 0.0], [3.0, 4.0]]),
+        )
+
+        assert result.total_area == 100.0
+        assert result.main_polygon_percentage == 90.0
+        assert result.max_distance_between_polygons == pytest.approx(5.0)
+        assert result.separate_territories[1]["centroid"] == (3.0, 4.0)
+
+    def test_analyze_with_mismatched_arrays(self) -> None:
+        """Test that ValueError is raised when precomputed arrays don't fit the geometry."""
+        large = Polygon([(0, 0), (0, 10), (10, 10), (10, 0)])
+        small = Polygon([(20, 0), (20, 5), (25, 5), (25, 0)])
+
+        with pytest.raises(ValueError, match="Expected 2 precomputed areas"):
+            TerritoryAnalyzer().analyze(
+                "TestCountry",
+                MultiPolygon([large, small]),
+                areas=np.array([100.0]),
+                centroids=np.array([[0.0, 0.0]]),
+            )
+
+    def test_analyze_all_matches_analyze(self) -> None:
+        """Test that batch analysis yields the same results as per-country analysis."""
+        israel = Polygon([(34, 29), (34, 33), (36, 33), (36, 29)])
+        russia = MultiPolygon(
+            [
+                Polygon([(30, 50), (30, 70), (180, 70), (180, 50)]),
+                Polygon([(19, 54), (19, 56), (23, 56), (23, 54)]),
+            ]
+        )
+        indonesia = MultiPolygon(
+            [
+                Polygon([(105, -8), (105, -6), (115, -6), (115, -8)]),
+                Polygon([(95, -5), (95, 0), (105, 0), (105, -5)]),
+                Polygon([(130, -9), (130, -2), (141, -2), (141, -9)]),
+            ]
+        )
+        countries = gpd.GeoDataFrame(
+            {
+                "name": ["Israel", "Nowhere", "Russia", "Indonesia"],
+                "geometry": [israel, None, russia, indonesia],
+            }
+        )
+
+        analyzer = TerritoryAnalyzer()
+        results = analyzer.analyze_all(countries)
+
+        assert [r.country_name for r in results] == ["Israel", "Russia", "Indonesia"]
+        assert [r.geometry_type for r in results] == [
+            CountryGeometryType.CONTINUOUS,
+            CountryGeometryType.HAS_EXCLAVE,
+            CountryGeometryType.ISLAND_NATION,
+        ]
+        for result, geometry in zip(results, [israel, russia, indonesia]):
+            expected = analyzer.analyze(result.country_name, geometry)
+            assert result.geometry_type == expected.geometry_type
+            assert result.polygon_count == expected.polygon_count
+            assert result.total_area == pytest.approx(expected.total_area)
+            assert result.max_distance_between_polygons == pytest.approx(
+                expected.max_distance_between_polygons
+            )
+
+    @pytest.mark.parametrize(
+        "threshold,expected",
+        [
+            (0.8, [0, 1, 2, 1]),
+            (0.95, [0, 2, 2, 2]),
+        ],
+    )
+    def test_classify_geometry_types(self, threshold: float, expected: list) -> None:
+        """Test the vectorized classification against the rule used by analyze."""
+        codes = _classify_geometry_types(
+            np.array([1, 2, 5, 3]), np.array([100.0, 90.0, 40.0, 80.0]), threshold
+        )
+
+        assert codes.tolist() == expected
+
+    @pytest.mark.parametrize("max_workers", [None, 1, 4])
+    def test_analyze_from_db_batch(self, countries_db: str, max_workers: Optional[int]) -> None:
+        """Test that batch analysis follows the requested order and skips unknown names."""
+        analyzer = TerritoryAnalyzer()
+
+        results = list(
+            analyzer.analyze_from_db_batch(
+                ["Russia", "Atlantis", "Israel"], countries_db, max_workers=max_workers
+            )
+        )
+
+        assert [name for name, _ in results] == ["Russia", "Israel"]
+        assert results[0][1].geometry_type == CountryGeometryType.HAS_EXCLAVE
+        assert results[1][1].geometry_type == CountryGeometryType.CONTINUOUS
+
+    @pytest.mark.parametrize("max_workers", [None, 4])
+    def test_analyze_from_db_batch_reports_failures(
+        self, countries_db: str, max_workers: Optional[int]
+    ) -> None:
+        """Test that failing countries are reported in order and the rest still analyzed."""
+        analyzer = TerritoryAnalyzer()
+        analyze = analyzer.analyze
+
+        def failing_analyze(name: str, geometry: Polygon) -> TerritoryAnalysisResult:
+            if name == "Russia":
+                raise RuntimeError("analysis failed")
+            return analyze(name, geometry)
+
+        errors: list[tuple[str, Exception]] = []
+        with patch.object(analyzer, "analyze", side_effect=failing_analyze):
+            results = list(
+                analyzer.analyze_from_db_batch(
+                    ["Dot", "Russia", "Atlantis", "Israel"],
+                    countries_db,
+                    max_workers=max_workers,
+                    on_error=lambda name, error: errors.append((name, error)),
+                )
+            )
+
+        assert [name for name, _ in results] == ["Israel"]
+        assert [(name, type(error)) for name, error in errors] == [
+            ("Dot", TypeError),
+            ("Russia", RuntimeError),
+            ("Atlantis", ValueError),
+        ]
+
+    def test_analyze_from_db_batch_logs_failures(
+        self, countries_db: str, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test that failures are logged when no error handler is given."""
+        results = list(TerritoryAnalyzer().analyze_from_db_batch(["Dot", "Israel"], countries_db))
+
+        assert [name for name, _ in results] == ["Israel"]
+        assert "Error analyzing Dot: Expected Polygon or MultiPolygon" in caplog.text
+
     def test_analyze_with_db(self) -> None:
         """Test analyze_from_db method."""
         # Mock load_country_geometry
@@ -249,3 +489,43 @@ class TestTerritoryAnalyzer:
             assert result.country_name == "Israel"
             assert result.geometry_type == CountryGeometryType.CONTINUOUS
             mock_load.assert_called_once_with("Israel", "test.db")
+
+
+class TestGetCountryTerritoryInfo:
+    """Test suite for the get_country_territory_info function."""
+
+    @pytest.mark.parametrize("include_territories", [True, False])
+    def test_include_territories(self, include_territories: bool) -> None:
+        """Test that the territory breakdown is only built when requested."""
+        israel_polygon = Polygon([(34, 29), (34, 33), (36, 33), (36, 29)])
+
+        with patch("maps.territory_analyzer.load_country_geometry", return_value=israel_polygon):
+            info = get_country_territory_info(
+                "Israel", "test.db", include_territories=include_territories
+            )
+
+        assert info["territory_type"] == "continuous"
+        assert ("territories" in info) is include_territories
+        if include_territories:
+            assert info["territories"] == [
+                {
+                    "area": 8.0,
+                    "percentage": 100.0,
+                    "coordinates": (35.0, 31.0),
+                    "index": 0,
+                }
+            ]
+
+    def test_territory_indices_point_into_geometry(self) -> None:
+        """Test that each territory's index refers back to its part of the geometry."""
+        small = Polygon([(20, 0), (20, 5), (25, 5), (25, 0)])
+        large = Polygon([(0, 0), (0, 10), (10, 10), (10, 0)])
+
+        with patch(
+            "maps.territory_analyzer.load_country_geometry",
+            return_value=MultiPolygon([small, large]),
+        ):
+            info = get_country_territory_info("TestCountry", "test.db")
+
+        assert [t["index"] for t in info["territories"]] == [1, 0]
+        assert [t["area"] for t in info["territories"]] == [100.0, 25.0]